@@ -78,8 +78,7 @@ class SolanaICOAnimation(Scene):
         # Animate
         self.play(Write(description))
         self.play(Write(features_title))
-        for feature in features:
-            self.play(Write(feature), run_time=0.7)
+        self.play(LaggedStart(*[Write(feature) for feature in features], lag_ratio=0.25, run_time=0.7 * len(features)))
 
         # Wait
         self.wait(2)
@@ -237,7 +236,11 @@ class SolanaICOAnimation(Scene):
         )
         x_label = axes.get_x_axis_label(Text("Tokens Sold", font_size=20, color=text_color), edge=DOWN, direction=DOWN, buff=0.4)
         y_label = axes.get_y_axis_label(Text("Price", font_size=20, color=text_color).rotate(90 * DEGREES), edge=LEFT, direction=LEFT, buff=0.4)
-        curve = axes.plot(lambda x: 10 + 0.8 * x, color=secondary_color, x_range=[0,100])
+        # Sample the curve once as NumPy arrays instead of calling a Python lambda per point;
+        # the same xs/ys vectors can be reused if the curve is ever animated frame by frame
+        xs = np.linspace(0, 100, 201)
+        ys = 10.0 + 0.8 * xs
+        curve = axes.plot_line_graph(xs, ys, line_color=secondary_color, add_vertex_dots=False)["line_graph"]
         
         graph_group = VGroup(axes, x_label, y_label, curve).move_to(RIGHT * 3.5 + DOWN*0.5)
 
@@ -280,12 +283,10 @@ class SolanaICOAnimation(Scene):
         thank_you.scale(0.8).next_to(master_group, DOWN, buff=0.8)
 
         self.play(Write(benefits_title))
-        for item in benefits_list:
-            self.play(Write(item), run_time=0.6)
+        self.play(LaggedStart(*[Write(item) for item in benefits_list], lag_ratio=0.25, run_time=0.6 * len(benefits_list)))
         
         self.play(Write(tech_title))
-        for item in tech_stack_list:
-            self.play(Write(item), run_time=0.5)
+        self.play(LaggedStart(*[Write(item) for item in tech_stack_list], lag_ratio=0.25, run_time=0.5 * len(tech_stack_list)))
 
         self.wait(2)
         self.play(Write(thank_you))
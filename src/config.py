@@ -1,38 +1,26 @@
 """Handles configuration loading for the Solana ICO CLI."""
 
+import functools
 import os
-import re
 from typing import Optional
+from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 from .exceptions import ConfigurationError
 
-# Load environment variables from a .env file if it exists
-# This allows for easy local configuration without setting system env vars
-load_dotenv()
-
 # --- Solana Cluster Configuration ---
 DEFAULT_SOLANA_CLUSTER_URL: str = "http://localhost:8899"  # Default to local cluster
-SOLANA_CLUSTER_URL: str = os.environ.get("SOLANA_CLUSTER_URL", DEFAULT_SOLANA_CLUSTER_URL)
-
-if not SOLANA_CLUSTER_URL:
-    # This case should ideally not happen with a default set, but good practice
-    raise ConfigurationError("SOLANA_CLUSTER_URL environment variable is not set and no default is available.")
-
-# Validate cluster URL format
-if not validate_cluster_url(SOLANA_CLUSTER_URL):
-    raise ConfigurationError(f"Invalid SOLANA_CLUSTER_URL format: {SOLANA_CLUSTER_URL}")
 
 # --- Solana Program ID Configuration ---
 # It's highly recommended to load the program ID from an environment variable
-# as it can change between deployments (devnet, testnet, mainnet).
-PROGRAM_ID_STR: Optional[str] = os.environ.get("SOLANA_PROGRAM_ID")
+# (SOLANA_PROGRAM_ID) as it can change between deployments (devnet, testnet, mainnet).
+# It is allowed to be unset; CLI commands that need it raise ConfigurationError.
 
-if not PROGRAM_ID_STR:
-    # If you have a *fixed* program ID for a specific deployment (e.g., local testing),
-    # you *could* uncomment the line below, but using env vars is more flexible.
-    # PROGRAM_ID_STR = "YourDefaultProgramIdHere..." # Replace with actual ID if needed as fallback
-    pass # Allow it to be None for now, CLI commands might require it explicitly if not set
+# Environment variables may also come from a .env file, which allows for easy
+# local configuration without setting system env vars. It is loaded on first
+# access rather than at import so commands that never read config don't pay
+# for the filesystem lookup.
+_DOTENV_LOADED: bool = False
 
 # You could add other configuration variables here as needed,
 # for example, default keypair paths, etc.
@@ -41,6 +29,21 @@ if not PROGRAM_ID_STR:
 # DEFAULT_KEYPAIR_PATH = os.path.expanduser("~/.config/solana/id.json")
 # KEYPAIR_PATH = os.environ.get("SOLANA_KEYPAIR_PATH", DEFAULT_KEYPAIR_PATH)
 
+# --- Validation Patterns ---
+_BASE58_CHARS = frozenset('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz')
+
+def _ensure_env() -> None:
+    """Loads variables from a .env file into the environment on first use."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+def _get_program_id_str() -> Optional[str]:
+    """Returns the raw SOLANA_PROGRAM_ID value, or None if it is not set."""
+    _ensure_env()
+    return os.environ.get("SOLANA_PROGRAM_ID")
+
 def get_program_id() -> str:
     """
     Retrieves the Program ID from configuration.
@@ -51,23 +54,52 @@ def get_program_id() -> str:
     Raises:
         ConfigurationError: If the Program ID is not configured or invalid.
     """
-    if not PROGRAM_ID_STR:
+    program_id_str = _get_program_id_str()
+    if not program_id_str:
         raise ConfigurationError(
             "SOLANA_PROGRAM_ID environment variable is not set. "
             "Please set this variable to your deployed program's ID."
         )
 
-    if not validate_program_id(PROGRAM_ID_STR):
+    return _checked_program_id(program_id_str)
+
+@functools.lru_cache(maxsize=8)
+def _checked_program_id(program_id: str) -> str:
+    """
+    Validates a program ID string once and memoizes the result.
+
+    Keyed on the string itself, so a changed SOLANA_PROGRAM_ID is still
+    validated while repeated lookups of the same ID skip the scan.
+
+    Args:
+        program_id: The program ID to validate.
+
+    Returns:
+        The program ID, unchanged.
+
+    Raises:
+        ConfigurationError: If the program ID format is invalid.
+    """
+    if not validate_program_id(program_id):
         raise ConfigurationError(
-            f"Invalid program ID format: {PROGRAM_ID_STR}. "
+            f"Invalid program ID format: {program_id}. "
             "Program IDs must be base58-encoded strings of 32 bytes (40-50 characters)."
         )
 
-    return PROGRAM_ID_STR
+    return program_id
 
 def get_cluster_url() -> str:
-    """Returns the configured Solana Cluster URL."""
-    return SOLANA_CLUSTER_URL
+    """
+    Returns the configured Solana Cluster URL.
+
+    Raises:
+        ConfigurationError: If SOLANA_CLUSTER_URL is set but empty.
+    """
+    _ensure_env()
+    cluster_url = os.environ.get("SOLANA_CLUSTER_URL", DEFAULT_SOLANA_CLUSTER_URL)
+    if not cluster_url:
+        raise ConfigurationError("SOLANA_CLUSTER_URL environment variable is not set and no default is available.")
+    return cluster_url
 
 def is_program_id_set() -> bool:
     """
@@ -76,7 +108,8 @@ def is_program_id_set() -> bool:
     Returns:
         True if Program ID is set, False otherwise.
     """
-    return PROGRAM_ID_STR is not None and len(PROGRAM_ID_STR.strip()) > 0
+    program_id_str = _get_program_id_str()
+    return program_id_str is not None and len(program_id_str.strip()) > 0
 
 def validate_cluster_url(url: str) -> bool:
     """
@@ -91,17 +124,22 @@ def validate_cluster_url(url: str) -> bool:
     if not url or not isinstance(url, str):
         return False
 
-    # Check if it's a valid HTTP/HTTPS URL
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE
-    )
-
-    return url_pattern.match(url) is not None
+    # Check if it's a valid HTTP/HTTPS URL: a dotted host (domain or IPv4) or localhost,
+    # an optional numeric port, no userinfo and no whitespace
+    if any(c.isspace() for c in url):
+        return False
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return False
+    if parsed.username is not None or parsed.password is not None:
+        return False
+    if parsed.hostname != "localhost" and "." not in parsed.hostname:
+        return False
+    try:
+        parsed.port
+    except ValueError:
+        return False
+    return True
 
 def validate_program_id(program_id: str) -> bool:
     """
@@ -121,8 +159,7 @@ def validate_program_id(program_id: str) -> bool:
         return False
 
     # Check if it's a valid base58 string (simplified check)
-    base58_chars = set('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz')
-    return all(c in base58_chars for c in program_id)
+    return _BASE58_CHARS.issuperset(program_id)
 
 def print_config() -> None:
     """Prints the current configuration values to stdout."""
@@ -146,17 +183,32 @@ def validate_configuration() -> None:
     """
     Validates the entire configuration and raises ConfigurationError if invalid.
 
+    Nothing is validated at import time; CLI entry points call this explicitly
+    when they need a fully checked configuration.
+
     Raises:
         ConfigurationError: If any configuration value is invalid.
     """
-    cluster_url = get_cluster_url()
+    _checked_cluster_url(get_cluster_url())
+
+    # Raises if the program ID is missing or invalid (validated once per ID)
+    get_program_id()
+
+@functools.lru_cache(maxsize=8)
+def _checked_cluster_url(cluster_url: str) -> str:
+    """
+    Validates a cluster URL once and memoizes the result.
+
+    Args:
+        cluster_url: The cluster URL to validate.
+
+    Returns:
+        The cluster URL, unchanged.
+
+    Raises:
+        ConfigurationError: If the cluster URL format is invalid.
+    """
     if not validate_cluster_url(cluster_url):
         raise ConfigurationError(f"Invalid cluster URL format: {cluster_url}")
 
-    try:
-        program_id = get_program_id()
-        if not validate_program_id(program_id):
-            raise ConfigurationError(f"Invalid program ID format: {program_id}")
-    except ConfigurationError:
-        # Re-raise if program ID is missing
-        raise
\ No newline at end of file
+    return cluster_url
\ No newline at end of file
@@ -7,7 +7,17 @@ token prices based on tokens sold, which can be used for informational purposes
 before executing actual buy/sell transactions on the Solana blockchain.
 """
 
-import math
+from typing import TYPE_CHECKING, Union
+
+from . import tokenomics
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Hoisted once at import so the estimator reduces to a single multiply-add,
+# whether it is given a scalar or a NumPy array of supply levels.
+_STARTING_PRICE: float = float(tokenomics.STARTING_PRICE)
+_INV_SCALING_FACTOR: float = 1.0 / tokenomics.SCALING_FACTOR
 
 # --- General Bonding Curve Formulas (Likely illustrative, not directly used by client) ---
 # def linear_price(supply, slope, initial_price):
@@ -26,14 +36,16 @@ import math
 #     return price
 # --- End General Formulas ---
 
-def calculate_price(tokens_sold: int) -> float:
+def calculate_price(tokens_sold: Union[int, float, "np.ndarray"]) -> Union[float, "np.ndarray"]:
     """
     Estimates the CTX token price based on the number of tokens sold,
     using the configured linear bonding curve parameters.
 
+    Accepts either a single value or a NumPy array of supply levels; arrays
+    are evaluated in one vectorized expression (e.g. for plotting the curve)
+    and an array of prices of the same shape is returned.
+
     Note: This is a client-side estimation. The actual transaction price
     is determined by the on-chain program logic during buy/sell operations.
     """
-    from . import tokenomics # Corrected import
-    # Ensure floating point division
-    return tokenomics.STARTING_PRICE * (1 + float(tokens_sold) / tokenomics.SCALING_FACTOR)
\ No newline at end of file
+    return _STARTING_PRICE * (1.0 + tokens_sold * _INV_SCALING_FACTOR)
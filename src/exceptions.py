@@ -32,6 +32,14 @@ class TokenPurchaseError(ICOError):
     """Exception raised for errors during token purchase."""
     pass
 
+class BatchPurchaseError(TokenPurchaseError):
+    """Exception raised when some purchases of a batch were rejected."""
+
+    def __init__(self, message: str, signatures):
+        super().__init__(message)
+        # One entry per order: the signature of each accepted purchase, None for rejected ones
+        self.signatures = signatures
+
 class TokenSaleError(ICOError):
     """Exception raised for errors during token sale."""
     pass
@@ -1,49 +1,129 @@
 """Manages Initial Coin Offering (ICO) interactions on the Solana blockchain."""
 
+import functools
+import logging
+import math
 import struct
-from typing import List
+from typing import Dict, List, Sequence, Tuple
 
 from solders.pubkey import Pubkey
 from solders.keypair import Keypair
 from solders.transaction import Transaction
-from solders.instruction import Instruction, AccountMeta
+from solders.instruction import AccountMeta, Instruction
+from solders.message import Message
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 import solders.system_program as system_program
 import solders.sysvar as sysvar
-from spl.token.instructions import (
-    get_associated_token_address,
-    create_associated_token_account,
-    TOKEN_PROGRAM_ID
-)
-from solders.rpc.responses import GetAccountInfoResp
+from spl.token.instructions import TOKEN_PROGRAM_ID
+from solders.rpc.responses import SendTransactionResp
 
 # Use relative imports within the 'src' directory
 from .solana_client import SolanaClient
-from .pda_utils import find_ico_state_pda, find_escrow_pda
+from .instruction_utils import create_and_add_instruction, create_idempotent_associated_token_account
+from .pda_utils import find_ico_state_pda, find_escrow_pda, find_associated_token_address
 from .exceptions import (
     ICOInitializationError,
     TokenPurchaseError,
+    BatchPurchaseError,
     TokenSaleError,
     EscrowWithdrawalError,
     TransactionError,
     SolanaIcoError,
+    SolanaConnectionError,
     PDAError,
 )
 
+logger = logging.getLogger(__name__)
+
 # Constants
 INSTRUCTION_INDEX_INITIALIZE = 0
 INSTRUCTION_INDEX_BUY_TOKENS = 1
 INSTRUCTION_INDEX_SELL_TOKENS = 2
 INSTRUCTION_INDEX_WITHDRAW_ESCROW = 3
 
-# Helper to create and add instruction (consider moving to a shared utils if used elsewhere)
-def _create_and_add_instruction(transaction: Transaction, program_id: Pubkey, *accounts: AccountMeta, data: bytes = b'') -> None:
-    """Creates an instruction and adds it to the transaction."""
-    instruction = Instruction(
-        program_id=program_id,
-        accounts=list(accounts),
-        data=data
-    )
-    transaction.add(instruction)
+# Instruction data layouts, compiled once instead of re-parsing the format on every pack
+INITIALIZE_DATA_LAYOUT = struct.Struct("<BQQQ")  # index, total_supply, base_price, scaling_factor
+AMOUNT_DATA_LAYOUT = struct.Struct("<BQ")  # index, amount (buy/sell/withdraw)
+
+# Read-only program/sysvar accounts that close out each instruction's account list,
+# built once instead of on every call
+_INIT_TAIL = (
+    AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=sysvar.RENT, is_signer=False, is_writable=False),
+)
+_BUY_TAIL = (
+    AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=sysvar.RENT, is_signer=False, is_writable=False),
+)
+_SELL_TAIL = (
+    AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+    AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False), # Token program needed for burning/transfer
+)
+_WITHDRAW_TAIL = (
+    AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+)
+
+# Headroom added on top of the simulated compute unit usage
+COMPUTE_UNIT_MARGIN = 1.1
+
+# Compute unit limits found by simulation, keyed by the (program, discriminator) of
+# each instruction, so every transaction shape is simulated once per process
+_compute_unit_limits: Dict[Tuple[Tuple[Pubkey, bytes], ...], int] = {}
+
+@functools.lru_cache(maxsize=256)
+def _pubkey_from_string(pubkey_str: str) -> Pubkey:
+    """Parses a base58 public key string, caching the result per string."""
+    return Pubkey.from_string(pubkey_str)
+
+def _with_compute_budget(
+    solana_client: SolanaClient,
+    transaction: Transaction,
+    fee_accounts: Sequence[Pubkey],
+) -> Transaction:
+    """
+    Returns a copy of the transaction with compute budget instructions prepended.
+
+    The compute unit limit is the simulated usage plus COMPUTE_UNIT_MARGIN instead
+    of the 200k default, and the compute unit price follows the recent priority
+    fees paid for fee_accounts. Either instruction is left out, with a warning,
+    if the node can't be reached for it, so the transaction can still be sent.
+
+    Raises:
+        TransactionError: If the simulated transaction fails; sending it would fail too.
+    """
+    message = transaction.message
+    # Decompile the message back into instructions so the budget ones can be prepended
+    instructions = [
+        Instruction(
+            message.account_keys[compiled.program_id_index],
+            bytes(compiled.data),
+            [AccountMeta(message.account_keys[i], message.is_signer(i), message.is_writable(i)) for i in compiled.accounts],
+        )
+        for compiled in message.instructions
+    ]
+    shape = tuple((ix.program_id, bytes(ix.data[:1])) for ix in instructions)
+    budget_instructions = []
+
+    units = _compute_unit_limits.get(shape)
+    if units is None:
+        try:
+            units = math.ceil(solana_client.simulate_compute_units(transaction) * COMPUTE_UNIT_MARGIN)
+            _compute_unit_limits[shape] = units
+        except SolanaConnectionError as e:
+            logger.warning("Could not simulate compute units, using the default limit: %s", e)
+    if units is not None:
+        budget_instructions.append(set_compute_unit_limit(units))
+
+    try:
+        priority_fee = solana_client.get_priority_fee(fee_accounts)
+        if priority_fee:
+            budget_instructions.append(set_compute_unit_price(priority_fee))
+    except SolanaConnectionError as e:
+        logger.warning("Could not estimate priority fee, sending without one: %s", e)
+
+    # The fee payer is always the first account key of a legacy message
+    return Transaction.new_unsigned(Message(budget_instructions + instructions, message.account_keys[0]))
 
 def _validate_and_convert_pubkeys(
     program_id_str: str,
@@ -52,10 +132,10 @@ def _validate_and_convert_pubkeys(
     token_mint_str: str
 ) -> tuple[Pubkey, Pubkey, Pubkey, Pubkey]:
     """Validates and converts public key strings to Pubkey objects."""
-    program_id_pubkey = Pubkey.from_string(program_id_str)
+    program_id_pubkey = _pubkey_from_string(program_id_str)
     buyer_pubkey = buyer_keypair.pubkey()
-    ico_owner_pubkey = Pubkey.from_string(ico_owner_pubkey_str)
-    token_mint_pubkey = Pubkey.from_string(token_mint_str)
+    ico_owner_pubkey = _pubkey_from_string(ico_owner_pubkey_str)
+    token_mint_pubkey = _pubkey_from_string(token_mint_str)
     return program_id_pubkey, buyer_pubkey, ico_owner_pubkey, token_mint_pubkey
 
 def _find_ico_pdases(
@@ -69,25 +149,42 @@ def _find_ico_pdases(
 
 def _handle_associated_token_account(
     solana_client: SolanaClient,
+    instructions: List[Instruction],
     buyer_pubkey: Pubkey,
-    token_mint_pubkey: Pubkey
-) -> Transaction:
-    """Handles creation of associated token account if it doesn't exist."""
-    buyer_token_account = get_associated_token_address(buyer_pubkey, token_mint_pubkey)
-    ata_tx = Transaction()
+    token_mint_pubkey: Pubkey,
+    ico_state_pda: Pubkey
+) -> Pubkey:
+    """
+    Appends creation of the buyer's associated token account to instructions if it doesn't exist.
 
-    try:
-        solana_client.get_account_info(buyer_token_account)
-    except SolanaIcoError:
-        print(f"Buyer ATA {buyer_token_account} not found. Creating...")
-        create_assoc_instruction = create_associated_token_account(
+    The existence of the buyer's ATA and the ICO state account is checked
+    together in a single getMultipleAccounts request.
+
+    Returns:
+        The buyer's associated token account address.
+
+    Raises:
+        SolanaIcoError: If the ICO state account does not exist.
+    """
+    buyer_token_account = find_associated_token_address(buyer_pubkey, token_mint_pubkey)
+
+    buyer_token_exists, ico_state_exists = solana_client.accounts_exist(
+        [buyer_token_account, ico_state_pda], cached=True
+    )
+    if not ico_state_exists:
+        raise SolanaIcoError(f"ICO state account {ico_state_pda} not found. Has the ICO been initialized?")
+
+    if not buyer_token_exists:
+        logger.debug("Buyer ATA %s not found. Creating...", buyer_token_account)
+        # Idempotent so the buy still lands if the ATA is created concurrently
+        create_assoc_instruction = create_idempotent_associated_token_account(
             payer=buyer_pubkey,
             owner=buyer_pubkey,
             mint=token_mint_pubkey,
         )
-        ata_tx.add(create_assoc_instruction)
+        instructions.append(create_assoc_instruction)
 
-    return ata_tx
+    return buyer_token_account
 
 def _create_buy_token_instruction(
     program_id_pubkey: Pubkey,
@@ -99,7 +196,7 @@ def _create_buy_token_instruction(
     amount_lamports: int
 ) -> tuple[bytes, List[AccountMeta]]:
     """Creates the instruction data and accounts for buying tokens."""
-    instruction_data = struct.pack("<BQ", INSTRUCTION_INDEX_BUY_TOKENS, amount_lamports)
+    instruction_data = AMOUNT_DATA_LAYOUT.pack(INSTRUCTION_INDEX_BUY_TOKENS, amount_lamports)
 
     accounts = [
         AccountMeta(pubkey=ico_state_pda, is_signer=False, is_writable=True),
@@ -107,9 +204,7 @@ def _create_buy_token_instruction(
         AccountMeta(pubkey=escrow_pda, is_signer=False, is_writable=True),
         AccountMeta(pubkey=token_mint_pubkey, is_signer=False, is_writable=True),
         AccountMeta(pubkey=buyer_token_account, is_signer=False, is_writable=True),
-        AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False),
-        AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
-        AccountMeta(pubkey=sysvar.SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False),
+        *_BUY_TAIL,
     ]
 
     return instruction_data, accounts
@@ -122,6 +217,7 @@ def initialize_ico(
     total_supply: int,
     base_price: int,
     scaling_factor: int,
+    compute_budget: bool = False,
 ) -> str:
     """
     Initializes the ICO state on the Solana blockchain.
@@ -135,6 +231,9 @@ def initialize_ico(
         base_price: Initial price in lamports.
         scaling_factor: Scaling factor for the bonding curve.
             (These parameters configure the on-chain bonding curve logic.)
+        compute_budget: If True, prepend compute unit limit and price instructions
+            (see _with_compute_budget). This costs a simulation and a fee lookup,
+            so it pays off only for clients that send many transactions.
 
     Returns:
         The transaction signature as a string.
@@ -145,17 +244,17 @@ def initialize_ico(
         PDAError: If PDA derivation fails.
     """
     try:
-        program_id_pubkey = Pubkey.from_string(program_id_str)
-        token_mint_pubkey = Pubkey.from_string(token_mint_str)
+        program_id_pubkey = _pubkey_from_string(program_id_str)
+        token_mint_pubkey = _pubkey_from_string(token_mint_str)
         owner_pubkey = owner_keypair.pubkey()
 
         # 1. Find PDAs using the utility function
         ico_state_pda, _ = find_ico_state_pda(owner_pubkey, program_id_pubkey)
         escrow_pda, _ = find_escrow_pda(owner_pubkey, program_id_pubkey)
 
-        # 2. Instruction data (using struct.pack for Borsh serialization)
-        instruction_data = struct.pack(
-            "<BQQQ", # Removed token_mint from pack as it's passed via accounts
+        # 2. Instruction data (Borsh-compatible little-endian layout)
+        # token_mint is not packed here as it's passed via accounts
+        instruction_data = INITIALIZE_DATA_LAYOUT.pack(
             INSTRUCTION_INDEX_INITIALIZE,  # Instruction index
             total_supply,
             base_price,
@@ -173,13 +272,15 @@ def initialize_ico(
             AccountMeta(pubkey=owner_pubkey, is_signer=True, is_writable=True), # Often writable for rent payment
             AccountMeta(pubkey=escrow_pda, is_signer=False, is_writable=True),
             AccountMeta(pubkey=token_mint_pubkey, is_signer=False, is_writable=False), # Pass mint account
-            AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=sysvar.SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False),
+            *_INIT_TAIL,
         ]
 
         # 4. Create the transaction and send using the client wrapper
-        transaction = Transaction()
-        _create_and_add_instruction(transaction, program_id_pubkey, *accounts, data=instruction_data)
+        instructions: List[Instruction] = []
+        create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+        transaction = Transaction.new_unsigned(Message(instructions, owner_pubkey))
+        if compute_budget:
+            transaction = _with_compute_budget(solana_client, transaction, [ico_state_pda, escrow_pda])
 
         result = solana_client.send_transaction(transaction, owner_keypair)
         # Optional: Confirm transaction
@@ -194,52 +295,15 @@ def initialize_ico(
         raise ICOInitializationError(f"Failed to initialize ICO: {e}") from e
 
 
-def _get_token_mint_from_ico_state(solana_client: SolanaClient, ico_state_pda: Pubkey) -> Pubkey:
-    """Helper to fetch and parse the token mint from the ICO state account."""
-    try:
-        ico_account_info: GetAccountInfoResp = solana_client.get_account_info(ico_state_pda)
-        if ico_account_info.value is None or ico_account_info.value.data is None:
-            raise SolanaIcoError(f"ICO state account {ico_state_pda} not found or has no data.")
-
-        account_data = ico_account_info.value.data
-        # Adjust unpacking based on the *actual* structure of your ICO state account data
-        # Example structure assumption (needs verification):
-        # owner: Pubkey (32 bytes)
-        # token_mint: Pubkey (32 bytes)
-        # escrow_account: Pubkey (32 bytes)
-        # total_supply: u64 (8 bytes)
-        # tokens_sold: u64 (8 bytes)
-        # base_price: u64 (8 bytes)
-        # scaling_factor: u64 (8 bytes)
-        # is_initialized: bool (1 byte)
-        # Example unpack format (verify offsets and types):
-        # unpacked_data = struct.unpack("<32s32s32sQQQQ?", account_data[:129]) # Example length
-        # token_mint_bytes = unpacked_data[1] # Example index
-
-        # --- Placeholder: Replace with actual unpacking logic ---
-        # This is a critical part that depends entirely on your on-chain program's state struct.
-        # For now, we raise an error indicating it needs implementation.
-        # If the mint is *not* stored in the state, this function needs removal/rethinking.
-        raise NotImplementedError("Parsing token mint from ICO state account data is not implemented. Verify account structure.")
-        # token_mint_pubkey = Pubkey(token_mint_bytes)
-        # return token_mint_pubkey
-        # --- End Placeholder ---
-
-    except struct.error as e:
-        raise SolanaIcoError(f"Failed to unpack ICO state account data for {ico_state_pda}: {e}. Check account structure.") from e
-    except SolanaIcoError as e:
-        raise e
-    except Exception as e:
-        raise SolanaIcoError(f"Error fetching or parsing ICO state account {ico_state_pda}: {e}") from e
-
-
 def buy_tokens(
     solana_client: SolanaClient,
     program_id_str: str,
     buyer_keypair: Keypair,
     amount_lamports: int,
     ico_owner_pubkey_str: str,
-    token_mint_str: str
+    token_mint_str: str,
+    compute_budget: bool = False,
+    skip_preflight: bool = False,
 ) -> str:
     """
     Allows a user to buy tokens from the ICO.
@@ -251,6 +315,11 @@ def buy_tokens(
         amount_lamports: The amount of SOL (in lamports) to spend.
         ico_owner_pubkey_str: The public key string of the ICO owner (needed for PDA derivation).
         token_mint_str: The SPL token mint address as a string.
+        compute_budget: If True, prepend compute unit limit and price instructions
+            (see _with_compute_budget). This costs a simulation and a fee lookup,
+            so it pays off only for clients that send many transactions.
+        skip_preflight: If True, send without the node's preflight simulation,
+            saving a round-trip at the cost of paying fees for failing transactions.
 
     Returns:
         The transaction signature as a string.
@@ -270,26 +339,26 @@ def buy_tokens(
         # Find PDAs
         ico_state_pda, escrow_pda = _find_ico_pdases(ico_owner_pubkey, program_id_pubkey)
 
-        # Handle associated token account
-        ata_tx = _handle_associated_token_account(solana_client, buyer_pubkey, token_mint_pubkey)
+        # Build a single transaction so ATA creation (if needed) and the buy
+        # land in one submission/confirmation round-trip
+        instructions: List[Instruction] = []
 
-        # Get buyer token account address
-        buyer_token_account = get_associated_token_address(buyer_pubkey, token_mint_pubkey)
+        # Handle associated token account
+        buyer_token_account = _handle_associated_token_account(
+            solana_client, instructions, buyer_pubkey, token_mint_pubkey, ico_state_pda
+        )
 
         # Create instruction data and accounts
         instruction_data, accounts = _create_buy_token_instruction(
             program_id_pubkey, ico_state_pda, buyer_pubkey, escrow_pda,
             token_mint_pubkey, buyer_token_account, amount_lamports
         )
+        create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+        transaction = Transaction.new_unsigned(Message(instructions, buyer_pubkey))
+        if compute_budget:
+            transaction = _with_compute_budget(solana_client, transaction, [ico_state_pda, escrow_pda])
 
-        # Create and send transaction
-        buy_tx = Transaction()
-        _create_and_add_instruction(buy_tx, program_id_pubkey, *accounts, data=instruction_data)
-
-        # Combine ATA creation and buy transaction if needed
-        final_tx = ata_tx.combine(buy_tx) if ata_tx.instructions else buy_tx
-
-        result = solana_client.send_transaction(final_tx, buyer_keypair)
+        result = solana_client.send_transaction(transaction, buyer_keypair, skip_preflight=skip_preflight)
         return str(result.value)
 
     except (ValueError, PDAError, NotImplementedError, SolanaIcoError) as e:
@@ -299,13 +368,117 @@ def buy_tokens(
     except Exception as e:
         raise TokenPurchaseError(f"Failed to buy tokens: {e}") from e
 
+def buy_tokens_many(
+    solana_client: SolanaClient,
+    program_id_str: str,
+    orders: Sequence[Tuple[Keypair, int]],
+    ico_owner_pubkey_str: str,
+    token_mint_str: str,
+    compute_budget: bool = False,
+    skip_preflight: bool = False,
+) -> List[str]:
+    """
+    Buys tokens for several buyers from the same ICO using batched RPC requests.
+
+    All buyers' ATAs and the ICO state are checked with one getMultipleAccounts
+    request, and all buy transactions are submitted in one JSON-RPC batch.
+    Identical orders are signed under different blockhashes, so none of them
+    is dropped as a duplicate.
+
+    Args:
+        solana_client: An instance of the SolanaClient.
+        program_id_str: The program ID as a string.
+        orders: (buyer_keypair, amount_lamports) pairs, one per buy.
+        ico_owner_pubkey_str: The public key string of the ICO owner (needed for PDA derivation).
+        token_mint_str: The SPL token mint address as a string.
+        compute_budget: If True, prepend compute unit limit and price instructions
+            (see _with_compute_budget). Orders share one simulation and fee lookup.
+        skip_preflight: If True, send without the node's preflight simulation,
+            saving a round-trip at the cost of paying fees for failing transactions.
+
+    Returns:
+        The transaction signatures as strings, in the same order as orders.
+
+    Raises:
+        BatchPurchaseError: If the node rejected some of the purchases; its
+            signatures attribute holds the signatures of the accepted ones.
+        TokenPurchaseError: If the purchase fails.
+        ValueError: If public key strings are invalid.
+        PDAError: If PDA derivation fails.
+        SolanaIcoError: If the ICO state account is not found.
+    """
+    if not orders:
+        return []
+    try:
+        program_id_pubkey = _pubkey_from_string(program_id_str)
+        ico_owner_pubkey = _pubkey_from_string(ico_owner_pubkey_str)
+        token_mint_pubkey = _pubkey_from_string(token_mint_str)
+
+        ico_state_pda, escrow_pda = _find_ico_pdases(ico_owner_pubkey, program_id_pubkey)
+
+        buyer_token_accounts = [
+            find_associated_token_address(buyer_keypair.pubkey(), token_mint_pubkey)
+            for buyer_keypair, _ in orders
+        ]
+        *buyer_token_exists, ico_state_exists = solana_client.accounts_exist(
+            [*buyer_token_accounts, ico_state_pda], cached=True
+        )
+        if not ico_state_exists:
+            raise SolanaIcoError(f"ICO state account {ico_state_pda} not found. Has the ICO been initialized?")
+
+        transactions = []
+        for (buyer_keypair, amount_lamports), buyer_token_account, token_account_exists in zip(
+            orders, buyer_token_accounts, buyer_token_exists
+        ):
+            buyer_pubkey = buyer_keypair.pubkey()
+            instructions: List[Instruction] = []
+            if not token_account_exists:
+                logger.debug("Buyer ATA %s not found. Creating...", buyer_token_account)
+                # Idempotent: the same buyer may appear in several orders of the batch
+                instructions.append(create_idempotent_associated_token_account(
+                    payer=buyer_pubkey,
+                    owner=buyer_pubkey,
+                    mint=token_mint_pubkey,
+                ))
+
+            instruction_data, accounts = _create_buy_token_instruction(
+                program_id_pubkey, ico_state_pda, buyer_pubkey, escrow_pda,
+                token_mint_pubkey, buyer_token_account, amount_lamports
+            )
+            create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+            transaction = Transaction.new_unsigned(Message(instructions, buyer_pubkey))
+            if compute_budget:
+                transaction = _with_compute_budget(solana_client, transaction, [ico_state_pda, escrow_pda])
+            transactions.append((transaction, [buyer_keypair]))
+
+        results = solana_client.send_transactions(transactions, skip_preflight=skip_preflight)
+        signatures = [str(result.value) if isinstance(result, SendTransactionResp) else None for result in results]
+        if None in signatures:
+            failures = [(i, result) for i, result in enumerate(results) if signatures[i] is None]
+            accepted = [signature for signature in signatures if signature is not None]
+            raise BatchPurchaseError(
+                f"{len(failures)} of {len(results)} purchases in batch failed: {failures}. Accepted: {accepted}",
+                signatures,
+            )
+        return signatures
+
+    except TransactionError as e:
+        # Checked before SolanaIcoError, which TransactionError subclasses
+        raise TokenPurchaseError(f"Transaction failed during batched token purchase: {e}") from e
+    except (ValueError, PDAError, SolanaIcoError) as e:
+        raise e  # Re-raise specific validation/setup errors
+    except Exception as e:
+        raise TokenPurchaseError(f"Failed to buy tokens: {e}") from e
+
 def sell_tokens(
     solana_client: SolanaClient,
     program_id_str: str,
     seller_keypair: Keypair,
     amount_tokens: int,
     ico_owner_pubkey_str: str,
-    token_mint_str: str # Added: Explicitly require token mint
+    token_mint_str: str, # Added: Explicitly require token mint
+    compute_budget: bool = False,
+    skip_preflight: bool = False,
 ) -> str:
     """
     Allows a user to sell tokens back to the ICO.
@@ -317,6 +490,11 @@ def sell_tokens(
         amount_tokens: The amount of tokens to sell.
         ico_owner_pubkey_str: The public key string of the ICO owner (needed for PDA derivation).
         token_mint_str: The SPL token mint address as a string.
+        compute_budget: If True, prepend compute unit limit and price instructions
+            (see _with_compute_budget). This costs a simulation and a fee lookup,
+            so it pays off only for clients that send many transactions.
+        skip_preflight: If True, send without the node's preflight simulation,
+            saving a round-trip at the cost of paying fees for failing transactions.
 
     Returns:
         The transaction signature as a string.
@@ -328,27 +506,30 @@ def sell_tokens(
         SolanaIcoError: If required accounts are not found or invalid.
     """
     try:
-        program_id_pubkey = Pubkey.from_string(program_id_str)
+        program_id_pubkey = _pubkey_from_string(program_id_str)
         seller_pubkey = seller_keypair.pubkey()
-        ico_owner_pubkey = Pubkey.from_string(ico_owner_pubkey_str) # Owner key needed for PDAs
-        token_mint_pubkey = Pubkey.from_string(token_mint_str) # Get mint from argument
+        ico_owner_pubkey = _pubkey_from_string(ico_owner_pubkey_str) # Owner key needed for PDAs
+        token_mint_pubkey = _pubkey_from_string(token_mint_str) # Get mint from argument
 
         # 1. Find PDAs using owner key
         ico_state_pda, _ = find_ico_state_pda(ico_owner_pubkey, program_id_pubkey)
         escrow_pda, _ = find_escrow_pda(ico_owner_pubkey, program_id_pubkey)
 
         # 2. Get Associated Token Account (ATA) for Seller
-        seller_token_account = get_associated_token_address(seller_pubkey, token_mint_pubkey)
-        # Ensure seller ATA exists (should exist if they bought tokens)
-        try:
-            solana_client.get_account_info(seller_token_account)
-        except SolanaIcoError as e:
-            raise TokenSaleError(f"Seller's token account {seller_token_account} not found.") from e
+        seller_token_account = find_associated_token_address(seller_pubkey, token_mint_pubkey)
+        # Ensure seller ATA (should exist if they bought tokens) and ICO state exist,
+        # checking both in a single round-trip
+        seller_token_exists, ico_state_exists = solana_client.accounts_exist(
+            [seller_token_account, ico_state_pda], cached=True
+        )
+        if not ico_state_exists:
+            raise SolanaIcoError(f"ICO state account {ico_state_pda} not found. Has the ICO been initialized?")
+        if not seller_token_exists:
+            raise TokenSaleError(f"Seller's token account {seller_token_account} not found.")
 
 
         # 4. Instruction data
-        # Assuming instruction index 2 for SellTokens
-        instruction_data = struct.pack("<BQ", 2, amount_tokens)
+        instruction_data = AMOUNT_DATA_LAYOUT.pack(INSTRUCTION_INDEX_SELL_TOKENS, amount_tokens)
 
         # 5. Create Accounts
         accounts = [
@@ -357,15 +538,17 @@ def sell_tokens(
             AccountMeta(pubkey=escrow_pda, is_signer=False, is_writable=True), # Pays SOL
             AccountMeta(pubkey=token_mint_pubkey, is_signer=False, is_writable=True), # Mint needs to be writable for burning tokens
             AccountMeta(pubkey=seller_token_account, is_signer=False, is_writable=True), # Sends CTX
-            AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False), # Token program needed for burning/transfer
+            *_SELL_TAIL,
         ]
 
         # 6. Create instruction and transaction
-        transaction = Transaction()
-        _create_and_add_instruction(transaction, program_id_pubkey, *accounts, data=instruction_data)
+        instructions: List[Instruction] = []
+        create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+        transaction = Transaction.new_unsigned(Message(instructions, seller_pubkey))
+        if compute_budget:
+            transaction = _with_compute_budget(solana_client, transaction, [ico_state_pda, escrow_pda])
 
-        result = solana_client.send_transaction(transaction, seller_keypair)
+        result = solana_client.send_transaction(transaction, seller_keypair, skip_preflight=skip_preflight)
         # Optional: Confirm transaction
         # solana_client.confirm_transaction(str(result.value))
         return str(result.value)
@@ -378,7 +561,13 @@ def sell_tokens(
         raise TokenSaleError(f"Failed to sell tokens: {e}") from e
 
 
-def withdraw_from_escrow(solana_client: SolanaClient, program_id_str: str, owner_keypair: Keypair, amount_lamports: int) -> str:
+def withdraw_from_escrow(
+    solana_client: SolanaClient,
+    program_id_str: str,
+    owner_keypair: Keypair,
+    amount_lamports: int,
+    compute_budget: bool = False,
+) -> str:
     """
     Allows the ICO owner to withdraw SOL from the escrow account.
 
@@ -387,6 +576,9 @@ def withdraw_from_escrow(solana_client: SolanaClient, program_id_str: str, owner
         program_id_str: The program ID as a string.
         owner_keypair: The keypair of the ICO owner.
         amount_lamports: The amount of SOL (in lamports) to withdraw.
+        compute_budget: If True, prepend compute unit limit and price instructions
+            (see _with_compute_budget). This costs a simulation and a fee lookup,
+            so it pays off only for clients that send many transactions.
 
     Returns:
         The transaction signature as a string.
@@ -397,7 +589,7 @@ def withdraw_from_escrow(solana_client: SolanaClient, program_id_str: str, owner
         PDAError: If PDA derivation fails.
     """
     try:
-        program_id_pubkey = Pubkey.from_string(program_id_str)
+        program_id_pubkey = _pubkey_from_string(program_id_str)
         owner_pubkey = owner_keypair.pubkey()
 
         # 1. Find PDAs
@@ -405,19 +597,22 @@ def withdraw_from_escrow(solana_client: SolanaClient, program_id_str: str, owner
         escrow_pda, _ = find_escrow_pda(owner_pubkey, program_id_pubkey)
 
         # 2. Instruction data
-        instruction_data = struct.pack("<BQ", INSTRUCTION_INDEX_WITHDRAW_ESCROW, amount_lamports)
+        instruction_data = AMOUNT_DATA_LAYOUT.pack(INSTRUCTION_INDEX_WITHDRAW_ESCROW, amount_lamports)
 
         # 3. Create Accounts
         accounts = [
            AccountMeta(pubkey=ico_state_pda, is_signer=False, is_writable=False), # Readonly usually
            AccountMeta(pubkey=owner_pubkey, is_signer=True, is_writable=True), # Receives SOL
            AccountMeta(pubkey=escrow_pda, is_signer=False, is_writable=True), # Pays SOL (needs authority via PDA)
-           AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False)
+           *_WITHDRAW_TAIL,
         ]
 
         # 4. Create instruction and transaction
-        transaction = Transaction()
-        _create_and_add_instruction(transaction, program_id_pubkey, *accounts, data=instruction_data)
+        instructions: List[Instruction] = []
+        create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+        transaction = Transaction.new_unsigned(Message(instructions, owner_pubkey))
+        if compute_budget:
+            transaction = _with_compute_budget(solana_client, transaction, [escrow_pda])
 
         result = solana_client.send_transaction(transaction, owner_keypair)
         # Optional: Confirm transaction
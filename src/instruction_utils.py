@@ -0,0 +1,55 @@
+"""Utilities for building Solana program instructions."""
+
+from typing import List
+
+from solders.pubkey import Pubkey
+from solders.instruction import Instruction, AccountMeta
+from spl.token.instructions import create_associated_token_account
+
+# Associated Token Account program instruction discriminator for CreateIdempotent
+_ATA_CREATE_IDEMPOTENT = b"\x01"
+
+def create_and_add_instruction(instructions: List[Instruction], program_id: Pubkey, accounts: List[AccountMeta], data: bytes = b'') -> None:
+    """
+    Creates a program instruction and appends it to the instruction list.
+
+    solders transactions are immutable, so callers collect their instructions
+    and build the transaction once, e.g. with
+    Transaction.new_unsigned(Message(instructions, payer)).
+
+    Args:
+        instructions: The instruction list to append the instruction to.
+        program_id: The public key of the Solana program to invoke.
+        accounts: The account metas for the instruction, in program order.
+        data: The serialized instruction data.
+    """
+    instruction = Instruction(
+        program_id=program_id,
+        accounts=accounts,
+        data=data
+    )
+    instructions.append(instruction)
+
+def create_idempotent_associated_token_account(payer: Pubkey, owner: Pubkey, mint: Pubkey) -> Instruction:
+    """
+    Creates an instruction that creates an associated token account if it doesn't exist.
+
+    Unlike spl's create_associated_token_account, the instruction succeeds as a
+    no-op when the account already exists, so it is safe to include even if the
+    account is created by another transaction before this one lands.
+
+    Args:
+        payer: The account paying for the new account's rent.
+        owner: The owner of the associated token account.
+        mint: The token mint.
+
+    Returns:
+        The CreateIdempotent instruction for the Associated Token Account program.
+    """
+    # Same accounts as Create; only the instruction discriminator differs
+    create_instruction = create_associated_token_account(payer=payer, owner=owner, mint=mint)
+    return Instruction(
+        program_id=create_instruction.program_id,
+        accounts=create_instruction.accounts,
+        data=_ATA_CREATE_IDEMPOTENT
+    )
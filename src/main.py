@@ -9,7 +9,7 @@ blockchain through a structured command hierarchy.
 """
 
 import sys
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
 import typer
 from typing_extensions import Annotated
@@ -27,14 +27,12 @@ from .exceptions import (
     SolanaIcoError,
     TransactionError,
 )
-from .ico_manager import (
-    buy_tokens,
-    initialize_ico,
-    sell_tokens,
-    withdraw_from_escrow,
-)
-from .resource_manager import access_resource, create_resource_access
-from .solana_client import SolanaClient
+
+# The Solana client stack (solana-py, solders, spl, httpx) is imported lazily
+# inside the commands that need it, so `info`, `config show` and `--help`
+# start without paying for it.
+if TYPE_CHECKING:
+    from .solana_client import SolanaClient
 
 # --- Typer App Initialization ---
 app = typer.Typer(
@@ -62,8 +60,11 @@ app.add_typer(config_app, name="config")
 LAMPORTS_PER_SOL: int = 1_000_000_000
 
 # --- Helper Function for Common Logic ---
-def get_client_and_program_id() -> Tuple[SolanaClient, str]:
+def get_client_and_program_id() -> Tuple["SolanaClient", str]:
     """Instantiates client and gets program ID, handling config errors."""
+    from .solana_client import SolanaClient
+
+    config.validate_configuration()  # Fails fast on a malformed cluster URL or program ID
     client = SolanaClient()  # Handles connection errors internally
     program_id = config.get_program_id()  # Handles missing program ID error
     return client, program_id
@@ -147,6 +148,8 @@ def init_ico_command(
     Example:
         python -m src.main ico init ~/keys/owner-keypair.json TokenMint111111111111111111111111111111111 1000000000 1000000000 100000000
     """
+    from .ico_manager import initialize_ico
+
     client, program_id = get_client_and_program_id()
     owner_keypair = client.load_keypair(keypair_path)
     signature = initialize_ico(
@@ -177,6 +180,8 @@ def buy_tokens_command(
     Example:
         python -m src.main ico buy ~/keys/buyer-keypair.json 1000000000 OwnerPubkey11111111111111111111111111111111 TokenMint111111111111111111111111111111111
     """
+    from .ico_manager import buy_tokens
+
     client, program_id = get_client_and_program_id()
     buyer_keypair = client.load_keypair(keypair_path)
     signature = buy_tokens(
@@ -207,6 +212,8 @@ def sell_tokens_command(
     Example:
         python -m src.main ico sell ~/keys/seller-keypair.json 100 OwnerPubkey11111111111111111111111111111111 TokenMint111111111111111111111111111111111
     """
+    from .ico_manager import sell_tokens
+
     client, program_id = get_client_and_program_id()
     seller_keypair = client.load_keypair(keypair_path)
     signature = sell_tokens(
@@ -234,6 +241,8 @@ def withdraw_command(
     Example:
         python -m src.main ico withdraw ~/keys/owner-keypair.json 500000000
     """
+    from .ico_manager import withdraw_from_escrow
+
     client, program_id = get_client_and_program_id()
     owner_keypair = client.load_keypair(keypair_path)
     signature = withdraw_from_escrow(
@@ -262,6 +271,8 @@ def create_resource_command(
     Example:
         python -m src.main resource create ~/keys/server-keypair.json premium_api 50000000
     """
+    from .resource_manager import create_resource_access
+
     client, program_id = get_client_and_program_id()
     server_keypair = client.load_keypair(keypair_path)
     signature = create_resource_access(
@@ -291,6 +302,8 @@ def access_resource_command(
     Example:
         python -m src.main resource access ~/keys/user-keypair.json premium_api ServerPubkey11111111111111111111111111111111 50000000
     """
+    from .resource_manager import access_resource
+
     client, program_id = get_client_and_program_id()
     user_keypair = client.load_keypair(keypair_path)
     signature = access_resource(
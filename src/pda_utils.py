@@ -1,8 +1,18 @@
 """Utilities for deriving Program Derived Addresses (PDAs)."""
 
+import functools
+
 from solders.pubkey import Pubkey # Corrected import
+from spl.token.instructions import get_associated_token_address
 from .exceptions import PDAError
 
+# PDA derivation is deterministic but costs up to 255 SHA-256 bump-seed attempts,
+# so results are memoized per (seed inputs, program ID). Failures are not cached.
+_PDA_CACHE_SIZE = 1024
+# One associated token account per (buyer/seller, mint), so this cache is sized for many users
+_ATA_CACHE_SIZE = 4096
+
+@functools.lru_cache(maxsize=_PDA_CACHE_SIZE)
 def find_ico_state_pda(owner_pubkey: Pubkey, program_id: Pubkey) -> tuple[Pubkey, int]:
     """
     Finds the Program Derived Address (PDA) for the ICO state account.
@@ -26,6 +36,7 @@ def find_ico_state_pda(owner_pubkey: Pubkey, program_id: Pubkey) -> tuple[Pubkey
     except Exception as e:
         raise PDAError(f"Failed to find ICO state PDA: {e}") from e
 
+@functools.lru_cache(maxsize=_PDA_CACHE_SIZE)
 def find_escrow_pda(owner_pubkey: Pubkey, program_id: Pubkey) -> tuple[Pubkey, int]:
     """
     Finds the Program Derived Address (PDA) for the escrow account.
@@ -49,6 +60,7 @@ def find_escrow_pda(owner_pubkey: Pubkey, program_id: Pubkey) -> tuple[Pubkey, i
     except Exception as e:
         raise PDAError(f"Failed to find escrow PDA: {e}") from e
 
+@functools.lru_cache(maxsize=_PDA_CACHE_SIZE)
 def find_resource_state_pda(server_pubkey: Pubkey, resource_id: str, program_id: Pubkey) -> tuple[Pubkey, int]:
     """
     Finds the Program Derived Address (PDA) for the resource state account.
@@ -77,4 +89,24 @@ def find_resource_state_pda(server_pubkey: Pubkey, resource_id: str, program_id:
         )
         return pda, bump
     except Exception as e:
-        raise PDAError(f"Failed to find resource state PDA for resource '{resource_id}': {e}") from e
\ No newline at end of file
+        raise PDAError(f"Failed to find resource state PDA for resource '{resource_id}': {e}") from e
+
+@functools.lru_cache(maxsize=_ATA_CACHE_SIZE)
+def find_associated_token_address(owner_pubkey: Pubkey, mint_pubkey: Pubkey) -> Pubkey:
+    """
+    Finds the associated token account (ATA) address for an owner and mint.
+
+    Args:
+        owner_pubkey: The public key of the token account owner.
+        mint_pubkey: The public key of the token mint.
+
+    Returns:
+        The associated token account public key.
+
+    Raises:
+        PDAError: If the address derivation fails.
+    """
+    try:
+        return get_associated_token_address(owner_pubkey, mint_pubkey)
+    except Exception as e:
+        raise PDAError(f"Failed to find associated token address: {e}") from e
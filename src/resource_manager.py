@@ -6,12 +6,14 @@ from typing import List
 from solders.pubkey import Pubkey
 from solders.keypair import Keypair
 from solders.transaction import Transaction
-from solders.instruction import Instruction, AccountMeta
+from solders.instruction import AccountMeta, Instruction
+from solders.message import Message
 import solders.system_program as system_program
 import solders.sysvar as sysvar
 
 # Use relative imports within the 'src' directory
 from .solana_client import SolanaClient
+from .instruction_utils import create_and_add_instruction
 from .pda_utils import find_resource_state_pda
 from .exceptions import (
     ResourceCreationError,
@@ -24,16 +26,6 @@ from .exceptions import (
 INSTRUCTION_INDEX_CREATE_RESOURCE = 4
 INSTRUCTION_INDEX_ACCESS_RESOURCE = 5
 
-# Helper to create and add instruction (consider moving to a shared utils if used elsewhere)
-def _create_and_add_instruction(transaction: Transaction, program_id: Pubkey, *accounts: AccountMeta, data: bytes = b''):
-    """Creates an instruction and adds it to the transaction."""
-    instruction = Instruction(
-        program_id=program_id,
-        accounts=list(accounts),
-        data=data
-    )
-    transaction.add(instruction)
-
 
 def create_resource_access(
     solana_client: SolanaClient,
@@ -84,13 +76,14 @@ def create_resource_access(
         accounts = [
             AccountMeta(pubkey=resource_state_pda, is_signer=False, is_writable=True), # Account to create/update
             AccountMeta(pubkey=server_pubkey, is_signer=True, is_writable=True), # Payer for rent, signer
-            AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=sysvar.SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False), # Needed for account creation rent
+            AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=sysvar.RENT, is_signer=False, is_writable=False), # Needed for account creation rent
         ]
 
         # 4. Create instruction and transaction
-        transaction = Transaction()
-        _create_and_add_instruction(transaction, program_id_pubkey, *accounts, data=instruction_data)
+        instructions: List[Instruction] = []
+        create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+        transaction = Transaction.new_unsigned(Message(instructions, server_pubkey))
 
         result = solana_client.send_transaction(transaction, server_keypair)
         # Optional: Confirm transaction
@@ -152,12 +145,13 @@ def access_resource(
             AccountMeta(pubkey=resource_state_pda, is_signer=False, is_writable=False), # Readonly, to check fee etc.
             AccountMeta(pubkey=user_pubkey, is_signer=True, is_writable=True),          # Payer
             AccountMeta(pubkey=server_pubkey, is_signer=False, is_writable=True),        # Recipient of payment
-            AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
         ]
 
         # 4. Create instruction and transaction
-        transaction = Transaction()
-        _create_and_add_instruction(transaction, program_id_pubkey, *accounts, data=instruction_data)
+        instructions: List[Instruction] = []
+        create_and_add_instruction(instructions, program_id_pubkey, accounts, data=instruction_data)
+        transaction = Transaction.new_unsigned(Message(instructions, user_pubkey))
 
         result = solana_client.send_transaction(transaction, user_keypair)
         # Optional: Confirm transaction
@@ -1,16 +1,32 @@
 """Provides a client wrapper for interacting with the Solana blockchain."""
 
+import functools
+import importlib.util
+import json
 import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import httpx
 from solana.rpc.api import Client # Stays
+from solana.rpc.providers.http import HTTPProvider
+from solana.rpc.providers.core import _after_request_unparsed
 # from solana.transaction import Transaction # Moved
-from solana.rpc.core import RPCException # Stays
+from solana.rpc.core import RPCException, _COMMITMENT_TO_SOLDERS # Stays
+from solana.rpc.types import DataSliceOpts, TxOpts
+from solana.exceptions import SolanaRpcException
 
 # Imports moved from solana.* to solders.*
 from solders.transaction import Transaction # Corrected import
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.system_program import TransferParams, transfer
-from solders.rpc.responses import GetBalanceResp, SendTransactionResp, GetAccountInfoResp # Specific response types from solders
+from solders.account import Account
+from solders.hash import Hash
+from solders.message import Message
+from solders.signature import Signature
+from solders.rpc.config import RpcSendTransactionConfig, RpcSimulateTransactionConfig
+from solders.rpc.requests import SendRawTransaction, SimulateLegacyTransaction
+from solders.rpc.responses import GetBalanceResp, SendTransactionResp, SimulateTransactionResp, GetAccountInfoResp, GetMultipleAccountsResp, RpcResponseContext, batch_from_json # Specific response types from solders
 # from solana.rpc.types import RPCResponse # Removed incorrect import
 
 from .exceptions import (
@@ -24,6 +40,92 @@ from . import config # Import the new config module
 # TODO: Move this to a dedicated config module later in the refactoring
 # SOLANA_CLUSTER_URL = os.environ.get("SOLANA_CLUSTER_URL", "http://localhost:8899") # Removed local definition
 
+# Maximum number of public keys the RPC accepts in one getMultipleAccounts request
+MAX_MULTIPLE_ACCOUNTS = 100
+
+# Zero-length data slice for existence checks: the node returns the account without its data
+_EXISTENCE_SLICE = DataSliceOpts(offset=0, length=0)
+
+# Times send_transaction submits a transaction whose delivery failed at the transport level
+SEND_ATTEMPTS = 3
+# Delay before the first resubmit; doubles on each further attempt
+SEND_RETRY_BASE_DELAY_SECONDS = 0.25
+
+# A blockhash stays valid for ~60-90s (150 blocks); reuse one for this long before refetching
+BLOCKHASH_TTL_SECONDS = 20.0
+# Times a transaction is re-signed under a newer blockhash when its signature was already sent
+DUPLICATE_SIGNATURE_ATTEMPTS = 5
+# Roughly one slot; how long to wait for a new blockhash when the node has none yet
+SLOT_SECONDS = 0.4
+
+# How long a priority fee estimate is reused before asking the node again
+PRIORITY_FEE_TTL_SECONDS = 10.0
+
+# Idle connections kept open per process for reuse by later RPC calls
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+# HTTP/2 needs the optional h2 package; without it httpx keeps HTTP/1.1 connections alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class _SessionHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider that sends every request through one long-lived httpx.Client.
+
+    solana-py's provider calls httpx.post() per request, which opens a fresh
+    connection (and TLS handshake) for every RPC call.
+
+    This relies on solana-py internals (_after_request_unparsed, the client's
+    _provider attribute and _COMMITMENT_TO_SOLDERS), so requirements.txt pins
+    solana and solders to the release line it was written against.
+    """
+
+    def __init__(self, endpoint: str, session: httpx.Client):
+        super().__init__(endpoint)
+        self._session = session
+
+    def make_request_unparsed(self, body: Any) -> str:
+        request_kwargs = self._before_request(body=body)
+        return _after_request_unparsed(self._session.post(**request_kwargs))
+
+    def make_batch_request_unparsed(self, reqs: Tuple[Any, ...]) -> str:
+        request_kwargs = self._before_batch_request(reqs)
+        return _after_request_unparsed(self._session.post(**request_kwargs))
+
+    def is_connected(self) -> bool:
+        try:
+            response = self._session.get(self.health_uri)
+            response.raise_for_status()
+        except (IOError, httpx.HTTPError) as err:
+            self.logger.error("Health check failed with error: %s", str(err))
+            return False
+        return response.status_code == httpx.codes.OK
+
+@functools.lru_cache(maxsize=1)
+def _get_http_session() -> httpx.Client:
+    """
+    Returns the process-wide HTTP session shared by all RPC clients.
+
+    Connections are kept alive between calls, so TLS handshakes happen once per
+    host rather than once per request.
+    """
+    return httpx.Client(
+        http2=_HTTP2_AVAILABLE,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS),
+    )
+
+@functools.lru_cache(maxsize=8)
+def _get_rpc_client(cluster_url: str) -> Client:
+    """
+    Returns the shared RPC client for a cluster URL.
+
+    Clients are cached per URL and all send their requests over the shared
+    keep-alive session from _get_http_session.
+    The returned client is shared and must not be closed by callers.
+    """
+    client = Client(cluster_url)
+    client._provider = _SessionHTTPProvider(cluster_url, _get_http_session())
+    return client
+
 class SolanaClient:
     """A wrapper around the Solana Client for common operations."""
 
@@ -45,14 +147,29 @@ class SolanaClient:
         if not self.cluster_url: # Should be caught by get_cluster_url, but belt-and-suspenders
             raise ConfigurationError("Solana cluster URL is configured but empty.")
 
+        # (slot, account) for accounts known to exist, keyed by public key. Only
+        # consulted when callers opt in with cached=True (see get_account_info).
+        self._account_cache: Dict[Pubkey, Tuple[int, Account]] = {}
+        # Accounts seen to exist by account_exists/accounts_exist(cached=True)
+        self._known_accounts: Set[Pubkey] = set()
+        # (blockhash, time.monotonic() when fetched), see _get_latest_blockhash
+        self._blockhash_cache: Optional[Tuple[Hash, float]] = None
+        # Signatures already sent under the cached blockhash, see _sign_transaction
+        self._sent_signatures: Set[Signature] = set()
+        # accounts -> (micro-lamports per compute unit, time.monotonic() when fetched)
+        self._priority_fee_cache: Dict[Tuple[Pubkey, ...], Tuple[int, float]] = {}
+
         try:
-            self.client = Client(self.cluster_url)
+            self.client = _get_rpc_client(self.cluster_url)
             # Test connection
             if not self.client.is_connected():
                  # Use self.cluster_url here
                  raise SolanaConnectionError(f"Failed to connect to Solana cluster at {self.cluster_url}")
             # Perform a simple request to confirm connectivity
-            self.client.get_latest_blockhash()
+            latest_blockhash_resp = self.client.get_latest_blockhash()
+            # Seed the blockhash cache so the first send doesn't need another round-trip
+            if latest_blockhash_resp.value is not None:
+                self._blockhash_cache = (latest_blockhash_resp.value.blockhash, time.monotonic())
         except RPCException as e:
              # Use self.cluster_url here
             raise SolanaConnectionError(f"RPC error connecting to Solana cluster at {self.cluster_url}: {e}") from e
@@ -109,7 +226,7 @@ class SolanaClient:
             response: GetBalanceResp = self.client.get_balance(public_key)
             if response.value is None: # Accessing .value directly on GetBalanceResp
                  raise SolanaConnectionError(f"Received null value when getting balance for {public_key_str}. RPC Response: {response}")
-            return response.value.value # Access the inner value field
+            return response.value # GetBalanceResp.value is the lamport balance
         except ValueError as e:
             raise ValueError(f"Invalid public key format: {public_key_str}") from e
         except RPCException as e:
@@ -141,7 +258,7 @@ class SolanaClient:
                 lamports=amount_lamports
             )
             transfer_instruction = transfer(params)
-            transaction = Transaction().add(transfer_instruction)
+            transaction = Transaction.new_unsigned(Message([transfer_instruction], from_keypair.pubkey()))
             # send_transaction now returns RPCResponse[SendTransactionResp]
             result = self.send_transaction(transaction, from_keypair)
             # Assuming result.value holds the signature (needs confirmation based on RPCResponse structure)
@@ -155,54 +272,420 @@ class SolanaClient:
         except Exception as e:
             raise TransactionError(f"Failed to send SOL: {e}") from e
 
-    def send_transaction(self, transaction: Transaction, *signers: Keypair) -> SendTransactionResp:
+    def send_transaction(
+        self,
+        transaction: Transaction,
+        *signers: Keypair,
+        skip_preflight: bool = False,
+        max_retries: Optional[int] = None,
+    ) -> SendTransactionResp:
         """
-        Sends a transaction to the Solana cluster.
+        Signs a transaction and sends it to the Solana cluster.
+
+        The transaction is signed and serialized once and submitted with send_raw,
+        so any resubmits send the identical bytes.
 
         Args:
             transaction: The transaction to send.
             *signers: The keypairs required to sign the transaction.
+            skip_preflight: Whether the node should skip simulating the transaction.
+                Only for callers that have already checked the transaction can succeed.
+            max_retries: How many times the node itself may rebroadcast the transaction;
+                None leaves it rebroadcasting until the blockhash expires.
 
         Returns:
             The SendTransactionResp containing the result of the send_transaction call.
 
         Raises:
-            TransactionError: If sending the transaction fails.
+            TransactionError: If signing or sending the transaction fails.
         """
         try:
-            # Ensure latest blockhash is set before sending
-            # Note: solana-py client might handle this automatically in recent versions,
-            # but explicit setting is safer.
-            latest_blockhash_resp = self.client.get_latest_blockhash() # Returns GetLatestBlockhashResp
-            if latest_blockhash_resp.value is None or latest_blockhash_resp.value.blockhash is None:
-                 raise TransactionError(f"Failed to get latest blockhash: {latest_blockhash_resp}")
-            transaction.recent_blockhash = latest_blockhash_resp.value.blockhash
+            self._sign_transaction(transaction, signers)
+            serialized_transaction = bytes(transaction)
+        except TransactionError:
+            raise
+        except Exception as e:
+            raise TransactionError(f"Failed to sign transaction: {e}") from e
+        self._forget_written_accounts(transaction)
+        return self.send_raw(serialized_transaction, TxOpts(skip_preflight=skip_preflight, max_retries=max_retries))
 
-            # Type hint with the specific solders response type
-            result: SendTransactionResp = self.client.send_transaction(transaction, *signers)
-            # Check for errors in the response if possible (structure might vary)
-            # Example check (adjust based on actual response structure if needed):
-            # if result.value is None: # SendTransactionResp value is the signature
-            #    raise TransactionError(f"Transaction failed: {result}")
-            return result
+    def send_raw(self, serialized_transaction: bytes, opts: Optional[TxOpts] = None) -> SendTransactionResp:
+        """
+        Sends an already signed and serialized transaction.
+
+        By default the node runs preflight simulation and keeps rebroadcasting the
+        transaction until it lands or its blockhash expires. If the request itself
+        fails at the transport level, the same bytes are resubmitted here with
+        exponential backoff. The signature doesn't change between attempts, so a
+        resubmit can never land twice.
+
+        Args:
+            serialized_transaction: The signed transaction in wire format.
+            opts: Options for the sendTransaction RPC.
+
+        Returns:
+            The SendTransactionResp containing the transaction signature.
+
+        Raises:
+            TransactionError: If sending the transaction fails.
+        """
+        if opts is None:
+            opts = TxOpts()
+        try:
+            for attempt in range(SEND_ATTEMPTS):
+                try:
+                    # Type hint with the specific solders response type
+                    result: SendTransactionResp = self.client.send_raw_transaction(serialized_transaction, opts=opts)
+                    return result
+                except SolanaRpcException:
+                    if attempt == SEND_ATTEMPTS - 1:
+                        raise
+                    time.sleep(SEND_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
         except RPCException as e:
             raise TransactionError(f"RPC error sending transaction: {e}") from e
         except Exception as e:
             raise TransactionError(f"Failed to send transaction: {e}") from e
 
-    # from solders.rpc.responses import GetAccountInfoResp # Import is already at the top
+    def send_transactions(
+        self,
+        transactions: Sequence[Tuple[Transaction, Sequence[Keypair]]],
+        skip_preflight: bool = False,
+        max_retries: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Signs several transactions and sends them in a single JSON-RPC batch request.
+
+        All transactions share the cached recent blockhash, so at most one
+        getLatestBlockhash call is made for the whole batch (more only if the
+        batch contains identical transactions, see _sign_transaction).
+
+        Args:
+            transactions: (transaction, signers) pairs to sign and send.
+            skip_preflight: Whether the node should skip simulating the transactions.
+            max_retries: How many times the node itself may rebroadcast each transaction;
+                None leaves it rebroadcasting until the blockhash expires.
+
+        Returns:
+            One result per transaction, in the same order: its SendTransactionResp,
+            or the RPC error object if the node rejected it. The rest of the batch
+            is sent either way.
+
+        Raises:
+            TransactionError: If signing fails or the batch request itself fails.
+        """
+        if not transactions:
+            return []
+        opts = TxOpts(skip_preflight=skip_preflight, max_retries=max_retries)
+        # The same config send_raw_transaction sends for these options
+        send_config = RpcSendTransactionConfig(
+            skip_preflight=opts.skip_preflight,
+            preflight_commitment=_COMMITMENT_TO_SOLDERS[opts.preflight_commitment],
+            max_retries=opts.max_retries,
+        )
+        try:
+            requests = []
+            for request_id, (transaction, signers) in enumerate(transactions):
+                self._sign_transaction(transaction, signers)
+                self._forget_written_accounts(transaction)
+                requests.append(SendRawTransaction(bytes(transaction), send_config, request_id))
+
+            return self.batch(requests, [SendTransactionResp] * len(requests))
+        except Exception as e:
+            raise TransactionError(f"Failed to send transaction batch: {e}") from e
+
+    def batch(self, requests: Sequence[Any], parsers: Sequence[Any]) -> List[Any]:
+        """
+        Sends several JSON-RPC requests in a single HTTP POST.
+
+        Args:
+            requests: Request objects from solders.rpc.requests, each with a distinct id.
+            parsers: Response classes from solders.rpc.responses, one per request.
+
+        Returns:
+            The parsed responses in the same order as requests. Requests that the node
+            rejected come back as RPC error objects instead of raising.
+
+        Raises:
+            SolanaConnectionError: If the batch request itself fails.
+        """
+        try:
+            raw_response = self.client._provider.make_batch_request_unparsed(tuple(requests))
+            responses = json.loads(raw_response)
+            # JSON-RPC 2.0 lets the node answer a batch in any order; restore request order by id
+            positions = {request.id: i for i, request in enumerate(requests)}
+            if len(positions) == len(requests):
+                responses.sort(key=lambda response: positions.get(response.get("id"), len(requests)))
+            return batch_from_json(json.dumps(responses), list(parsers))
+        except RPCException as e:
+            raise SolanaConnectionError(f"RPC error sending batch request: {e}") from e
+        except Exception as e:
+            raise SolanaConnectionError(f"Failed to send batch request: {e}") from e
+
+    def _get_latest_blockhash(self, refresh: bool = False) -> Hash:
+        """
+        Returns a recent blockhash to use as a transaction's recent_blockhash.
+
+        The blockhash is cached for BLOCKHASH_TTL_SECONDS, well inside its validity
+        window, so back-to-back sends share one getLatestBlockhash round-trip.
+
+        Args:
+            refresh: If True, ask the node for its latest blockhash even if the
+                cached one has not expired.
+
+        Raises:
+            TransactionError: If the RPC response has no blockhash.
+        """
+        now = time.monotonic()
+        if self._blockhash_cache is not None and not refresh:
+            blockhash, fetched_at = self._blockhash_cache
+            if now - fetched_at < BLOCKHASH_TTL_SECONDS:
+                return blockhash
+
+        latest_blockhash_resp = self.client.get_latest_blockhash() # Returns GetLatestBlockhashResp
+        if latest_blockhash_resp.value is None or latest_blockhash_resp.value.blockhash is None:
+             raise TransactionError(f"Failed to get latest blockhash: {latest_blockhash_resp}")
+        blockhash = latest_blockhash_resp.value.blockhash
+        if self._blockhash_cache is None or self._blockhash_cache[0] != blockhash:
+            # Nothing can collide with signatures made under the previous blockhash
+            self._sent_signatures.clear()
+        self._blockhash_cache = (blockhash, now)
+        return blockhash
+
+    def _sign_transaction(self, transaction: Transaction, signers: Sequence[Keypair]) -> None:
+        """
+        Signs a transaction with the cached blockhash, unless that would repeat a sent signature.
 
-    def get_account_info(self, public_key: Pubkey) -> GetAccountInfoResp:
-         """Gets account information."""
+        The same instructions signed under the same blockhash give the same
+        signature, and the cluster drops the repeat as a duplicate. So a
+        transaction whose signature was already sent is re-signed under a newer
+        blockhash, waiting about a slot between attempts for one to appear.
+
+        Raises:
+            TransactionError: If no unused blockhash turns up after
+                DUPLICATE_SIGNATURE_ATTEMPTS refetches.
+        """
+        transaction.sign(list(signers), self._get_latest_blockhash())
+        attempts = 0
+        while transaction.signatures[0] in self._sent_signatures:
+            if attempts == DUPLICATE_SIGNATURE_ATTEMPTS:
+                raise TransactionError(f"Transaction {transaction.signatures[0]} was already sent and no newer blockhash is available")
+            if attempts:
+                time.sleep(SLOT_SECONDS)
+            attempts += 1
+            transaction.sign(list(signers), self._get_latest_blockhash(refresh=True))
+        self._sent_signatures.add(transaction.signatures[0])
+
+    def get_account_info(self, public_key: Pubkey, cached: bool = False) -> GetAccountInfoResp:
+         """
+         Gets account information.
+
+         Args:
+             public_key: The public key of the account.
+             cached: If True, reuse a previous response for this account instead of
+                 issuing another RPC. The response is dropped once this client sends a
+                 transaction that writes to the account; changes made by anyone else
+                 are only seen after clear_account_cache. Responses for missing
+                 accounts are never cached.
+
+         Returns:
+             The GetAccountInfoResp for the account.
+
+         Raises:
+             SolanaConnectionError: If the RPC request fails.
+         """
+         if cached:
+             cached_entry = self._account_cache.get(public_key)
+             if cached_entry is not None:
+                 slot, account = cached_entry
+                 return GetAccountInfoResp(account, RpcResponseContext(slot))
          try:
              # Type hint with the specific solders response type
              response: GetAccountInfoResp = self.client.get_account_info(public_key)
+             if cached and response.value is not None:
+                 self._account_cache[public_key] = (response.context.slot, response.value)
              return response
          except RPCException as e:
              raise SolanaConnectionError(f"RPC error getting account info for {public_key}: {e}") from e
          except Exception as e:
              raise SolanaConnectionError(f"Failed to get account info for {public_key}: {e}") from e
 
+    def account_exists(self, public_key: Pubkey, cached: bool = False) -> bool:
+        """
+        Checks whether an account exists without downloading its data.
+
+        Args:
+            public_key: The public key of the account.
+            cached: If True, trust a previous sighting of the account instead of
+                issuing another RPC (see get_account_info). Missing accounts are
+                always rechecked.
+
+        Returns:
+            True if the account exists.
+
+        Raises:
+            SolanaConnectionError: If the RPC request fails.
+        """
+        return self.accounts_exist([public_key], cached=cached)[0]
+
+    def accounts_exist(self, public_keys: List[Pubkey], cached: bool = False) -> List[bool]:
+        """
+        Checks whether several accounts exist in a single getMultipleAccounts request.
+
+        Account data is requested with a zero-length slice, so only the account
+        metadata comes back over the wire.
+
+        Args:
+            public_keys: The public keys of the accounts.
+            cached: If True, trust previous sightings of the accounts (see account_exists).
+
+        Returns:
+            Whether each account exists, in the same order as public_keys.
+
+        Raises:
+            SolanaConnectionError: If the RPC request fails.
+        """
+        exists = [False] * len(public_keys)
+        missing_indices = []
+        for i, public_key in enumerate(public_keys):
+            if cached and (public_key in self._known_accounts or public_key in self._account_cache):
+                exists[i] = True
+            else:
+                missing_indices.append(i)
+
+        if not missing_indices:
+            return exists
+
+        fetched = self._fetch_multiple_accounts([public_keys[i] for i in missing_indices], _EXISTENCE_SLICE)
+        for i, (_slot, account) in zip(missing_indices, fetched):
+            exists[i] = account is not None
+            if cached and account is not None:
+                self._known_accounts.add(public_keys[i])
+        return exists
+
+    def _fetch_multiple_accounts(
+        self, public_keys: List[Pubkey], data_slice: Optional[DataSliceOpts] = None
+    ) -> List[Tuple[int, Optional[Account]]]:
+        """
+        Fetches accounts with getMultipleAccounts, splitting the keys into chunks the RPC accepts.
+
+        Returns:
+            (context slot, account or None) for each key, in the same order as public_keys.
+
+        Raises:
+            SolanaConnectionError: If the RPC request fails.
+        """
+        results: List[Tuple[int, Optional[Account]]] = []
+        # getMultipleAccounts accepts a limited number of keys per request
+        for start in range(0, len(public_keys), MAX_MULTIPLE_ACCOUNTS):
+            chunk = public_keys[start:start + MAX_MULTIPLE_ACCOUNTS]
+            try:
+                response: GetMultipleAccountsResp = self.client.get_multiple_accounts(chunk, data_slice=data_slice)
+            except RPCException as e:
+                raise SolanaConnectionError(f"RPC error getting accounts {public_keys}: {e}") from e
+            except Exception as e:
+                raise SolanaConnectionError(f"Failed to get accounts {public_keys}: {e}") from e
+
+            slot = response.context.slot
+            results.extend((slot, account) for account in response.value)
+        return results
+
+    def _forget_written_accounts(self, transaction: Transaction) -> None:
+        """
+        Drops the accounts a transaction writes to from the account caches.
+
+        Called for every transaction sent, whether or not it lands: a successful
+        one may change or close the accounts, and a failed one may have failed
+        because a cached account no longer exists.
+        """
+        message = transaction.message
+        for i, public_key in enumerate(message.account_keys):
+            if message.is_writable(i):
+                self._account_cache.pop(public_key, None)
+                self._known_accounts.discard(public_key)
+
+    def clear_account_cache(self) -> None:
+        """Drops all accounts cached by get_account_info/accounts_exist."""
+        self._account_cache.clear()
+        self._known_accounts.clear()
+
+    def simulate_compute_units(self, transaction: Transaction) -> int:
+        """
+        Simulates a transaction and returns the compute units it consumed.
+
+        The transaction doesn't need to be signed: signatures aren't verified and
+        the node substitutes its own recent blockhash.
+
+        Args:
+            transaction: The transaction to simulate.
+
+        Returns:
+            The number of compute units the simulation consumed.
+
+        Raises:
+            SolanaConnectionError: If the simulation cannot be run.
+            TransactionError: If the simulated transaction fails.
+        """
+        # solana-py's simulate_transaction only builds requests for its own legacy Transaction type
+        request = SimulateLegacyTransaction(
+            transaction, RpcSimulateTransactionConfig(sig_verify=False, replace_recent_blockhash=True)
+        )
+        try:
+            resp: SimulateTransactionResp = self.client._provider.make_request(request, SimulateTransactionResp)
+        except RPCException as e:
+            raise SolanaConnectionError(f"RPC error simulating transaction: {e}") from e
+        except Exception as e:
+            raise SolanaConnectionError(f"Failed to simulate transaction: {e}") from e
+        if resp.value.err is not None:
+            raise TransactionError(f"Transaction simulation failed: {resp.value.err}")
+        if resp.value.units_consumed is None:
+            raise SolanaConnectionError("Simulation response did not report compute units consumed")
+        return resp.value.units_consumed
+
+    def get_priority_fee(self, writable_accounts: Sequence[Pubkey]) -> int:
+        """
+        Estimates a compute unit price from the fees recently paid to write the given accounts.
+
+        The estimate is the median of the non-zero fees over the slots the node
+        reports, and is cached per account set for PRIORITY_FEE_TTL_SECONDS.
+
+        Args:
+            writable_accounts: The accounts the transaction will write to.
+
+        Returns:
+            The compute unit price in micro-lamports, 0 if no recent fees were paid.
+
+        Raises:
+            SolanaConnectionError: If the fees cannot be fetched.
+        """
+        key = tuple(writable_accounts)
+        now = time.monotonic()
+        cached = self._priority_fee_cache.get(key)
+        if cached is not None and now - cached[1] < PRIORITY_FEE_TTL_SECONDS:
+            return cached[0]
+
+        # solders has no request type for getRecentPrioritizationFees, so post the JSON directly
+        body = {
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "getRecentPrioritizationFees",
+            "params": [[str(pubkey) for pubkey in key]],
+        }
+        try:
+            response = _get_http_session().post(str(self.client._provider.endpoint_uri), json=body)
+            response.raise_for_status()
+            payload = response.json()
+            if "error" in payload:
+                raise SolanaConnectionError(f"RPC error: {payload['error']}")
+            fees = sorted(entry["prioritizationFee"] for entry in payload["result"] if entry["prioritizationFee"])
+        except SolanaConnectionError:
+            raise
+        except Exception as e:
+            raise SolanaConnectionError(f"Failed to get recent prioritization fees: {e}") from e
+
+        fee = fees[len(fees) // 2] if fees else 0
+        self._priority_fee_cache[key] = (fee, now)
+        return fee
+
     def confirm_transaction(self, signature: str, commitment: str = "confirmed"):
         """Confirms a transaction."""
         try:
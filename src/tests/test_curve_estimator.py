@@ -8,8 +8,14 @@ against the configured tokenomics parameters.
 """
 
 import unittest
-import curve_estimator # Corrected import (assuming pytest runs from root with src in pythonpath)
-import tokenomics # Corrected import
+# Imported through the src package so curve_estimator's relative imports resolve
+from src import curve_estimator
+from src import tokenomics
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only needed for the array test
+    np = None
 
 class TestCurveEstimator(unittest.TestCase): # Renamed class
 
@@ -39,5 +45,14 @@ class TestCurveEstimator(unittest.TestCase): # Renamed class
         expected_price = tokenomics.STARTING_PRICE * (1 + float(tokens_sold) / tokenomics.SCALING_FACTOR)
         self.assertAlmostEqual(curve_estimator.calculate_price(tokens_sold), expected_price, places=15) # Use assertAlmostEqual for float comparison
 
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_calculate_price_array(self):
+        """Tests that an array of supply levels is priced element-wise."""
+        tokens_sold = np.array([0, 1000, 50_000_000])
+        prices = curve_estimator.calculate_price(tokens_sold)
+        self.assertEqual(prices.shape, tokens_sold.shape)
+        for sold, price in zip(tokens_sold, prices):
+            self.assertAlmostEqual(price, curve_estimator.calculate_price(int(sold)), places=15)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -11,23 +11,27 @@ import unittest
 import struct
 from unittest.mock import patch, MagicMock, ANY
 
-# Import modules and classes from src
-import ico_manager
-from solana_client import SolanaClient
-from exceptions import ICOInitializationError, TokenPurchaseError, TokenSaleError, EscrowWithdrawalError, TransactionError, PDAError, SolanaIcoError
+# Import modules and classes through the src package so relative imports resolve
+from src import ico_manager
+from src.solana_client import SolanaClient
+from src.instruction_utils import create_idempotent_associated_token_account
+from src.exceptions import ICOInitializationError, TokenPurchaseError, BatchPurchaseError, TokenSaleError, EscrowWithdrawalError, TransactionError, PDAError, SolanaIcoError, SolanaConnectionError
 
 # Import solders types
 from solders.pubkey import Pubkey
 from solders.keypair import Keypair
-from solders.transaction import Transaction, TransactionError as SoldersTxError # Alias to avoid clash
+from solders.signature import Signature
+from solders.transaction import Transaction
 from solders.instruction import Instruction, AccountMeta
+from solders.message import Message
 from solders.rpc.responses import SendTransactionResp, GetAccountInfoResp
-from solders.rpc.types import RPCResponse, Context
+from solders.rpc.errors import InvalidParamsMessage
 import solders.system_program as system_program
 import solders.sysvar as sysvar
+from spl.token.instructions import TOKEN_PROGRAM_ID
 
 # Mock data
-MOCK_PROGRAM_ID_STR = "ProgId111111111111111111111111111111111111"
+MOCK_PROGRAM_ID_STR = str(Keypair().pubkey())
 MOCK_PROGRAM_ID = Pubkey.from_string(MOCK_PROGRAM_ID_STR)
 MOCK_OWNER_KEYPAIR = Keypair()
 MOCK_OWNER_PUBKEY = MOCK_OWNER_KEYPAIR.pubkey()
@@ -35,14 +39,13 @@ MOCK_BUYER_KEYPAIR = Keypair()
 MOCK_BUYER_PUBKEY = MOCK_BUYER_KEYPAIR.pubkey()
 MOCK_SELLER_KEYPAIR = Keypair()
 MOCK_SELLER_PUBKEY = MOCK_SELLER_KEYPAIR.pubkey()
-MOCK_TOKEN_MINT_STR = "Mint1111111111111111111111111111111111111"
+MOCK_TOKEN_MINT_STR = str(Keypair().pubkey())
 MOCK_TOKEN_MINT = Pubkey.from_string(MOCK_TOKEN_MINT_STR)
 MOCK_ICO_STATE_PDA = Pubkey.new_unique()
 MOCK_ESCROW_PDA = Pubkey.new_unique()
 MOCK_BUYER_ATA = Pubkey.new_unique() # Mock Associated Token Account
 MOCK_SELLER_ATA = Pubkey.new_unique()
-MOCK_SIGNATURE_STR = "MockSigICO" + "A" * 54 # Approx length
-MOCK_SIGNATURE = SendTransactionResp(value=Pubkey.from_string(MOCK_SIGNATURE_STR[:32])) # Simplified mock response
+MOCK_SIGNATURE = SendTransactionResp(Signature.new_unique())
 
 # Mock SolanaClient instance
 mock_solana_client = MagicMock(spec=SolanaClient)
@@ -50,23 +53,18 @@ mock_solana_client = MagicMock(spec=SolanaClient)
 class TestIcoManager(unittest.TestCase):
 
     def setUp(self):
-        # Reset mocks before each test
-        mock_solana_client.reset_mock()
+        # Reset mocks (including side effects left by failure tests) before each test
+        mock_solana_client.reset_mock(return_value=True, side_effect=True)
+        # Public key parsing is memoized; clear it so Pubkey.from_string patches are hit
+        ico_manager._pubkey_from_string.cache_clear()
         # Mock successful transaction sending by default
         mock_solana_client.send_transaction.return_value = MOCK_SIGNATURE
 
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string')
-    @patch('ico_manager.Transaction')
-    @patch('ico_manager._create_and_add_instruction')
-    def test_initialize_ico_success(self, mock_create_add_ix, mock_tx_constructor, mock_pubkey_from_string, mock_find_escrow, mock_find_ico_state):
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.Pubkey.from_string', wraps=Pubkey.from_string) # Keep original behavior
+    def test_initialize_ico_success(self, mock_pubkey_from_string, mock_find_escrow, mock_find_ico_state):
         """Tests successful ICO initialization."""
-        # Arrange mocks
-        mock_pubkey_from_string.side_effect = lambda s: Pubkey.from_string(s) # Keep original behavior
-        mock_tx_instance = MagicMock(spec=Transaction)
-        mock_tx_constructor.return_value = mock_tx_instance
-
         total_supply = 1_000_000_000
         base_price = 1000
         scaling_factor = 100_000
@@ -89,14 +87,16 @@ class TestIcoManager(unittest.TestCase):
             AccountMeta(pubkey=MOCK_OWNER_PUBKEY, is_signer=True, is_writable=True),
             AccountMeta(pubkey=MOCK_ESCROW_PDA, is_signer=False, is_writable=True),
             AccountMeta(pubkey=MOCK_TOKEN_MINT, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False),
-            AccountMeta(pubkey=sysvar.SYSVAR_RENT_PUBKEY, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=sysvar.RENT, is_signer=False, is_writable=False),
         ]
-        mock_create_add_ix.assert_called_once_with(mock_tx_instance, MOCK_PROGRAM_ID, *expected_accounts, data=expected_instruction_data)
-        mock_solana_client.send_transaction.assert_called_once_with(mock_tx_instance, MOCK_OWNER_KEYPAIR)
+        sent_transaction = mock_solana_client.send_transaction.call_args.args[0]
+        expected_instruction = Instruction(MOCK_PROGRAM_ID, expected_instruction_data, expected_accounts)
+        self.assertEqual(sent_transaction.message, Message([expected_instruction], MOCK_OWNER_PUBKEY))
+        mock_solana_client.send_transaction.assert_called_once_with(sent_transaction, MOCK_OWNER_KEYPAIR)
         self.assertEqual(signature, str(MOCK_SIGNATURE.value)) # Compare string representation
 
-    @patch('ico_manager.find_ico_state_pda', side_effect=PDAError("PDA Derivation Failed"))
+    @patch('src.ico_manager.find_ico_state_pda', side_effect=PDAError("PDA Derivation Failed"))
     def test_initialize_ico_pda_error(self, mock_find_ico_state):
         """Tests ICOInitializationError when PDA derivation fails."""
         with self.assertRaises(PDAError): # Expect the original PDAError
@@ -105,9 +105,9 @@ class TestIcoManager(unittest.TestCase):
                  1, 1, 1
              )
 
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string', side_effect=ValueError("Invalid Key"))
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.Pubkey.from_string', side_effect=ValueError("Invalid Key"))
     def test_initialize_ico_value_error(self, mock_pubkey_from_string, mock_find_escrow, mock_find_ico_state):
          """Tests re-raising ValueError for invalid pubkeys."""
          with self.assertRaises(ValueError): # Expect the original ValueError
@@ -116,15 +116,10 @@ class TestIcoManager(unittest.TestCase):
                  1, 1, 1
              )
 
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string', side_effect=lambda s: Pubkey.from_string(s))
-    @patch('ico_manager.Transaction')
-    @patch('ico_manager._create_and_add_instruction')
-    def test_initialize_ico_transaction_error(self, mock_create_add_ix, mock_tx_constructor, mock_pubkey_from_string, mock_find_escrow, mock_find_ico_state):
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    def test_initialize_ico_transaction_error(self, mock_find_escrow, mock_find_ico_state):
         """Tests ICOInitializationError when send_transaction fails."""
-        mock_tx_instance = MagicMock(spec=Transaction)
-        mock_tx_constructor.return_value = mock_tx_instance
         # Simulate transaction failure
         mock_solana_client.send_transaction.side_effect = TransactionError("RPC Error")
 
@@ -137,48 +132,156 @@ class TestIcoManager(unittest.TestCase):
 
 
     # --- buy_tokens Tests ---
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string', side_effect=lambda s: Pubkey.from_string(s))
-    def test_buy_tokens_not_implemented_error(self, mock_pubkey, mock_escrow, mock_ico_state):
-        """Tests that buy_tokens raises NotImplementedError due to token mint logic."""
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.find_associated_token_address', return_value=MOCK_BUYER_ATA)
+    def test_buy_tokens_success(self, mock_get_ata, mock_escrow, mock_ico_state):
+        """Tests that buy_tokens sends a single buy instruction when the buyer's ATA exists."""
+        mock_solana_client.accounts_exist.return_value = [True, True]
         amount_lamports = 10000
 
-        with self.assertRaisesRegex(NotImplementedError, "Token mint determination for 'buy_tokens' is not implemented"):
-            ico_manager.buy_tokens(
-                mock_solana_client, MOCK_PROGRAM_ID_STR, MOCK_BUYER_KEYPAIR, amount_lamports, str(MOCK_OWNER_PUBKEY)
-            )
-        # Ensure PDAs were found before the error
+        signature = ico_manager.buy_tokens(
+            mock_solana_client, MOCK_PROGRAM_ID_STR, MOCK_BUYER_KEYPAIR, amount_lamports, str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
+        )
+
         mock_ico_state.assert_called_once_with(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
         mock_escrow.assert_called_once_with(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
+        expected_instruction = Instruction(MOCK_PROGRAM_ID, struct.pack("<BQ", 1, amount_lamports), [
+            AccountMeta(pubkey=MOCK_ICO_STATE_PDA, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=MOCK_BUYER_PUBKEY, is_signer=True, is_writable=True),
+            AccountMeta(pubkey=MOCK_ESCROW_PDA, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=MOCK_TOKEN_MINT, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=MOCK_BUYER_ATA, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=sysvar.RENT, is_signer=False, is_writable=False),
+        ])
+        sent_transaction = mock_solana_client.send_transaction.call_args.args[0]
+        self.assertEqual(sent_transaction.message, Message([expected_instruction], MOCK_BUYER_PUBKEY))
+        self.assertEqual(signature, str(MOCK_SIGNATURE.value))
 
     # --- sell_tokens Tests ---
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string', side_effect=lambda s: Pubkey.from_string(s))
-    def test_sell_tokens_not_implemented_error(self, mock_pubkey, mock_escrow, mock_ico_state):
-        """Tests that sell_tokens raises NotImplementedError due to token mint logic."""
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.find_associated_token_address', return_value=MOCK_SELLER_ATA)
+    def test_sell_tokens_success(self, mock_get_ata, mock_escrow, mock_ico_state):
+        """Tests that sell_tokens sends the sell instruction signed by the seller."""
+        mock_solana_client.accounts_exist.return_value = [True, True]
         amount_tokens = 50
 
-        with self.assertRaisesRegex(NotImplementedError, "Token mint determination for 'sell_tokens' is not implemented"):
-            ico_manager.sell_tokens(
-                mock_solana_client, MOCK_PROGRAM_ID_STR, MOCK_SELLER_KEYPAIR, amount_tokens, str(MOCK_OWNER_PUBKEY)
+        signature = ico_manager.sell_tokens(
+            mock_solana_client, MOCK_PROGRAM_ID_STR, MOCK_SELLER_KEYPAIR, amount_tokens, str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
+        )
+
+        expected_instruction = Instruction(MOCK_PROGRAM_ID, struct.pack("<BQ", 2, amount_tokens), [
+            AccountMeta(pubkey=MOCK_ICO_STATE_PDA, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=MOCK_SELLER_PUBKEY, is_signer=True, is_writable=True),
+            AccountMeta(pubkey=MOCK_ESCROW_PDA, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=MOCK_TOKEN_MINT, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=MOCK_SELLER_ATA, is_signer=False, is_writable=True),
+            AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False),
+            AccountMeta(pubkey=TOKEN_PROGRAM_ID, is_signer=False, is_writable=False),
+        ])
+        sent_transaction = mock_solana_client.send_transaction.call_args.args[0]
+        self.assertEqual(sent_transaction.message, Message([expected_instruction], MOCK_SELLER_PUBKEY))
+        # Preflight stays on unless the caller opts out
+        mock_solana_client.send_transaction.assert_called_once_with(sent_transaction, MOCK_SELLER_KEYPAIR, skip_preflight=False)
+        self.assertEqual(signature, str(MOCK_SIGNATURE.value))
+
+
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.find_associated_token_address', return_value=MOCK_BUYER_ATA)
+    def test_buy_tokens_creates_missing_ata(self, mock_get_ata, mock_escrow, mock_ico_state):
+        """Tests that buy_tokens checks ATA and ICO state in one request and creates a missing ATA."""
+        mock_solana_client.accounts_exist.return_value = [False, True] # ATA missing, ICO state exists
+
+        ico_manager.buy_tokens(
+            mock_solana_client, MOCK_PROGRAM_ID_STR, MOCK_BUYER_KEYPAIR, 10000, str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
+        )
+
+        mock_solana_client.accounts_exist.assert_called_once_with([MOCK_BUYER_ATA, MOCK_ICO_STATE_PDA], cached=True)
+        mock_solana_client.get_account_info.assert_not_called()
+        sent_transaction = mock_solana_client.send_transaction.call_args.args[0]
+        create_ata_instruction = create_idempotent_associated_token_account(
+            payer=MOCK_BUYER_PUBKEY, owner=MOCK_BUYER_PUBKEY, mint=MOCK_TOKEN_MINT
+        )
+        # The ATA is created in the same transaction, ahead of the buy instruction
+        self.assertEqual(len(sent_transaction.message.instructions), 2)
+        self.assertEqual(sent_transaction.message.instructions[0], sent_transaction.message.compile_instruction(create_ata_instruction))
+        mock_solana_client.send_transaction.assert_called_once_with(sent_transaction, MOCK_BUYER_KEYPAIR, skip_preflight=False)
+
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.find_associated_token_address', side_effect=[MOCK_BUYER_ATA, MOCK_SELLER_ATA])
+    @patch('src.ico_manager.create_idempotent_associated_token_account', wraps=create_idempotent_associated_token_account)
+    def test_buy_tokens_many_batches_requests(self, mock_create_ata, mock_get_ata, mock_escrow, mock_ico_state):
+        """Tests that buy_tokens_many uses one account lookup and one batched send for all orders."""
+        mock_solana_client.accounts_exist.return_value = [True, False, True] # Second buyer has no ATA
+        mock_solana_client.send_transactions.return_value = [MOCK_SIGNATURE, MOCK_SIGNATURE]
+        orders = [(MOCK_BUYER_KEYPAIR, 10000), (MOCK_SELLER_KEYPAIR, 20000)]
+
+        signatures = ico_manager.buy_tokens_many(
+            mock_solana_client, MOCK_PROGRAM_ID_STR, orders, str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
+        )
+
+        mock_solana_client.accounts_exist.assert_called_once_with(
+            [MOCK_BUYER_ATA, MOCK_SELLER_ATA, MOCK_ICO_STATE_PDA], cached=True
+        )
+        mock_create_ata.assert_called_once_with(payer=MOCK_SELLER_PUBKEY, owner=MOCK_SELLER_PUBKEY, mint=MOCK_TOKEN_MINT)
+        mock_solana_client.send_transactions.assert_called_once_with(ANY, skip_preflight=False)
+        (buyer_transaction, buyer_signers), (seller_transaction, seller_signers) = mock_solana_client.send_transactions.call_args.args[0]
+        self.assertEqual((buyer_signers, seller_signers), ([MOCK_BUYER_KEYPAIR], [MOCK_SELLER_KEYPAIR]))
+        self.assertEqual(len(buyer_transaction.message.instructions), 1)
+        self.assertEqual(len(seller_transaction.message.instructions), 2) # ATA creation, then the buy
+        self.assertEqual(seller_transaction.message.account_keys[0], MOCK_SELLER_PUBKEY) # Each buyer pays its own fee
+        mock_solana_client.send_transaction.assert_not_called()
+        self.assertEqual(signatures, [str(MOCK_SIGNATURE.value)] * 2)
+
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.find_associated_token_address', side_effect=[MOCK_BUYER_ATA, MOCK_SELLER_ATA])
+    def test_buy_tokens_many_partial_failure_keeps_signatures(self, mock_get_ata, mock_escrow, mock_ico_state):
+        """Tests that a partly rejected batch reports the signatures of the accepted purchases."""
+        mock_solana_client.accounts_exist.return_value = [True, True, True]
+        mock_solana_client.send_transactions.return_value = [MOCK_SIGNATURE, InvalidParamsMessage("rejected")]
+        orders = [(MOCK_BUYER_KEYPAIR, 10000), (MOCK_SELLER_KEYPAIR, 20000)]
+
+        with self.assertRaisesRegex(BatchPurchaseError, "1 of 2 purchases in batch failed") as raised:
+            ico_manager.buy_tokens_many(
+                mock_solana_client, MOCK_PROGRAM_ID_STR, orders, str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
             )
-        # Ensure PDAs were found before the error
-        mock_ico_state.assert_called_once_with(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
-        mock_escrow.assert_called_once_with(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
+        self.assertEqual(raised.exception.signatures, [str(MOCK_SIGNATURE.value), None])
 
+    def test_buy_tokens_many_no_orders(self):
+        """Tests that an empty order list makes no RPC calls."""
+        signatures = ico_manager.buy_tokens_many(
+            mock_solana_client, MOCK_PROGRAM_ID_STR, [], str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
+        )
+
+        self.assertEqual(signatures, [])
+        mock_solana_client.accounts_exist.assert_not_called()
+        mock_solana_client.send_transactions.assert_not_called()
+
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    @patch('src.ico_manager.find_associated_token_address', return_value=MOCK_SELLER_ATA)
+    def test_sell_tokens_missing_seller_ata(self, mock_get_ata, mock_escrow, mock_ico_state):
+        """Tests TokenSaleError when the seller's token account does not exist."""
+        mock_solana_client.accounts_exist.return_value = [False, True] # ATA missing, ICO state exists
+
+        with self.assertRaisesRegex(TokenSaleError, "Seller's token account .* not found"):
+            ico_manager.sell_tokens(
+                mock_solana_client, MOCK_PROGRAM_ID_STR, MOCK_SELLER_KEYPAIR, 50, str(MOCK_OWNER_PUBKEY), MOCK_TOKEN_MINT_STR
+            )
+        mock_solana_client.accounts_exist.assert_called_once_with([MOCK_SELLER_ATA, MOCK_ICO_STATE_PDA], cached=True)
+        mock_solana_client.send_transaction.assert_not_called()
 
     # --- withdraw_from_escrow Tests ---
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string', side_effect=lambda s: Pubkey.from_string(s))
-    @patch('ico_manager.Transaction')
-    @patch('ico_manager._create_and_add_instruction')
-    def test_withdraw_from_escrow_success(self, mock_create_add_ix, mock_tx_constructor, mock_pubkey, mock_find_escrow, mock_find_ico_state):
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    def test_withdraw_from_escrow_success(self, mock_find_escrow, mock_find_ico_state):
         """Tests successful withdrawal from escrow."""
-        mock_tx_instance = MagicMock(spec=Transaction)
-        mock_tx_constructor.return_value = mock_tx_instance
         amount_lamports = 50000
 
         signature = ico_manager.withdraw_from_escrow(
@@ -193,21 +296,18 @@ class TestIcoManager(unittest.TestCase):
            AccountMeta(pubkey=MOCK_ICO_STATE_PDA, is_signer=False, is_writable=False),
            AccountMeta(pubkey=MOCK_OWNER_PUBKEY, is_signer=True, is_writable=True),
            AccountMeta(pubkey=MOCK_ESCROW_PDA, is_signer=False, is_writable=True),
-           AccountMeta(pubkey=system_program.SYS_PROGRAM_ID, is_signer=False, is_writable=False)
+           AccountMeta(pubkey=system_program.ID, is_signer=False, is_writable=False)
         ]
-        mock_create_add_ix.assert_called_once_with(mock_tx_instance, MOCK_PROGRAM_ID, *expected_accounts, data=expected_instruction_data)
-        mock_solana_client.send_transaction.assert_called_once_with(mock_tx_instance, MOCK_OWNER_KEYPAIR)
+        sent_transaction = mock_solana_client.send_transaction.call_args.args[0]
+        expected_instruction = Instruction(MOCK_PROGRAM_ID, expected_instruction_data, expected_accounts)
+        self.assertEqual(sent_transaction.message, Message([expected_instruction], MOCK_OWNER_PUBKEY))
+        mock_solana_client.send_transaction.assert_called_once_with(sent_transaction, MOCK_OWNER_KEYPAIR)
         self.assertEqual(signature, str(MOCK_SIGNATURE.value))
 
-    @patch('ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
-    @patch('ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
-    @patch('ico_manager.Pubkey.from_string', side_effect=lambda s: Pubkey.from_string(s))
-    @patch('ico_manager.Transaction')
-    @patch('ico_manager._create_and_add_instruction')
-    def test_withdraw_from_escrow_tx_error(self, mock_create_add_ix, mock_tx_constructor, mock_pubkey, mock_find_escrow, mock_find_ico_state):
+    @patch('src.ico_manager.find_ico_state_pda', return_value=(MOCK_ICO_STATE_PDA, 255))
+    @patch('src.ico_manager.find_escrow_pda', return_value=(MOCK_ESCROW_PDA, 254))
+    def test_withdraw_from_escrow_tx_error(self, mock_find_escrow, mock_find_ico_state):
         """Tests EscrowWithdrawalError on transaction failure."""
-        mock_tx_instance = MagicMock(spec=Transaction)
-        mock_tx_constructor.return_value = mock_tx_instance
         mock_solana_client.send_transaction.side_effect = TransactionError("Withdraw Failed")
 
         with self.assertRaisesRegex(EscrowWithdrawalError, "Transaction failed during escrow withdrawal: Withdraw Failed"):
@@ -217,5 +317,62 @@ class TestIcoManager(unittest.TestCase):
         mock_solana_client.send_transaction.assert_called_once()
 
 
+class TestComputeBudget(unittest.TestCase):
+
+    def setUp(self):
+        mock_solana_client.reset_mock()
+        mock_solana_client.simulate_compute_units.side_effect = None
+        mock_solana_client.get_priority_fee.side_effect = None
+        ico_manager._compute_unit_limits.clear()
+
+    def _make_transaction(self):
+        instruction = Instruction(MOCK_PROGRAM_ID, struct.pack("<BQ", 1, 1000), [AccountMeta(MOCK_ICO_STATE_PDA, False, True)])
+        return Transaction.new_unsigned(Message([instruction], MOCK_BUYER_PUBKEY)), instruction
+
+    def test_with_compute_budget_prepends_limit_and_price(self):
+        """Tests that the simulated limit (plus margin) and fee estimate are added before the ICO instruction."""
+        mock_solana_client.simulate_compute_units.return_value = 1000
+        mock_solana_client.get_priority_fee.return_value = 5
+        transaction, instruction = self._make_transaction()
+
+        budgeted = ico_manager._with_compute_budget(mock_solana_client, transaction, [MOCK_ICO_STATE_PDA])
+
+        self.assertEqual(budgeted.message, Message([
+            ico_manager.set_compute_unit_limit(1100),
+            ico_manager.set_compute_unit_price(5),
+            instruction,
+        ], MOCK_BUYER_PUBKEY))
+        mock_solana_client.simulate_compute_units.assert_called_once_with(transaction)
+        mock_solana_client.get_priority_fee.assert_called_once_with([MOCK_ICO_STATE_PDA])
+
+    def test_with_compute_budget_simulates_each_shape_once(self):
+        """Tests that transactions with the same instructions reuse the simulated limit."""
+        mock_solana_client.simulate_compute_units.return_value = 1000
+        mock_solana_client.get_priority_fee.return_value = 0
+
+        ico_manager._with_compute_budget(mock_solana_client, self._make_transaction()[0], [MOCK_ICO_STATE_PDA])
+        ico_manager._with_compute_budget(mock_solana_client, self._make_transaction()[0], [MOCK_ICO_STATE_PDA])
+
+        mock_solana_client.simulate_compute_units.assert_called_once()
+
+    def test_with_compute_budget_falls_back_on_rpc_errors(self):
+        """Tests that unreachable simulation and fee lookups leave only the original instructions."""
+        mock_solana_client.simulate_compute_units.side_effect = SolanaConnectionError("simulation unavailable")
+        mock_solana_client.get_priority_fee.side_effect = SolanaConnectionError("fees unavailable")
+        transaction, instruction = self._make_transaction()
+
+        budgeted = ico_manager._with_compute_budget(mock_solana_client, transaction, [MOCK_ICO_STATE_PDA])
+
+        self.assertEqual(budgeted.message, Message([instruction], MOCK_BUYER_PUBKEY))
+        self.assertEqual(ico_manager._compute_unit_limits, {})
+
+    def test_with_compute_budget_failed_simulation_aborts(self):
+        """Tests that a transaction that fails in simulation is not sent."""
+        mock_solana_client.simulate_compute_units.side_effect = TransactionError("custom program error: 0x1")
+
+        with self.assertRaises(TransactionError):
+            ico_manager._with_compute_budget(mock_solana_client, self._make_transaction()[0], [MOCK_ICO_STATE_PDA])
+        self.assertEqual(ico_manager._compute_unit_limits, {})
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
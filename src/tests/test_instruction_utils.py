@@ -0,0 +1,53 @@
+"""
+Unit tests for the instruction utilities module.
+
+This module contains unit tests for the shared instruction-building helper
+used by the ICO and resource managers, verifying that instructions are built
+with the expected program ID, accounts and data before being appended to a
+transaction's instruction list.
+"""
+
+import unittest
+
+# Import function from src
+import instruction_utils
+
+# Import solders types
+from solders.pubkey import Pubkey
+from solders.instruction import Instruction, AccountMeta
+from spl.token.instructions import create_associated_token_account
+
+# Mock data
+MOCK_PROGRAM_ID = Pubkey.new_unique()
+MOCK_ACCOUNT_A = Pubkey.new_unique()
+MOCK_ACCOUNT_B = Pubkey.new_unique()
+
+class TestInstructionUtils(unittest.TestCase):
+
+    def test_create_and_add_instruction(self):
+        """Tests that the instruction is built from the given accounts and data and appended to the list."""
+        instructions = []
+        accounts = [
+            AccountMeta(pubkey=MOCK_ACCOUNT_A, is_signer=True, is_writable=True),
+            AccountMeta(pubkey=MOCK_ACCOUNT_B, is_signer=False, is_writable=False),
+        ]
+
+        instruction_utils.create_and_add_instruction(instructions, MOCK_PROGRAM_ID, accounts, data=b"\x01\x02")
+
+        expected_instruction = Instruction(program_id=MOCK_PROGRAM_ID, accounts=accounts, data=b"\x01\x02")
+        self.assertEqual(instructions, [expected_instruction])
+
+    def test_create_idempotent_associated_token_account(self):
+        """Tests that the idempotent ATA instruction matches Create except for its discriminator."""
+        payer = Pubkey.new_unique()
+        mint = Pubkey.new_unique()
+
+        instruction = instruction_utils.create_idempotent_associated_token_account(payer=payer, owner=payer, mint=mint)
+
+        create_instruction = create_associated_token_account(payer=payer, owner=payer, mint=mint)
+        self.assertEqual(instruction.program_id, create_instruction.program_id)
+        self.assertEqual(instruction.accounts, create_instruction.accounts)
+        self.assertEqual(bytes(instruction.data), b"\x01")
+
+if __name__ == "__main__":
+    unittest.main()
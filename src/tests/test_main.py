@@ -76,7 +76,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn(f"Successfully sent {amount_lamports} lamports.", result.stdout)
         self.assertIn(f"Transaction signature: {MOCK_SIGNATURE}", result.stdout)
 
-    @patch('main.initialize_ico')
+    @patch('ico_manager.initialize_ico')
     @patch('main.get_client_and_program_id')
     def test_ico_init_command(self, mock_get_client, mock_init_ico):
         """Tests the 'ico init' command."""
@@ -109,7 +109,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn("ICO initialized successfully.", result.stdout)
         self.assertIn(f"Transaction signature: {MOCK_SIGNATURE}", result.stdout)
 
-    @patch('main.buy_tokens')
+    @patch('ico_manager.buy_tokens')
     @patch('main.get_client_and_program_id')
     def test_ico_buy_command(self, mock_get_client, mock_buy_tokens):
         """Tests the 'ico buy' command."""
@@ -141,7 +141,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn(f"Successfully bought tokens with {amount_lamports} lamports.", result.stdout)
         self.assertIn(f"Transaction signature: {MOCK_SIGNATURE}", result.stdout)
 
-    @patch('main.sell_tokens')
+    @patch('ico_manager.sell_tokens')
     @patch('main.get_client_and_program_id')
     def test_ico_sell_command(self, mock_get_client, mock_sell_tokens):
         """Tests the 'ico sell' command."""
@@ -173,7 +173,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn(f"Successfully sold {amount_tokens} tokens.", result.stdout)
         self.assertIn(f"Transaction signature: {MOCK_SIGNATURE}", result.stdout)
 
-    @patch('main.withdraw_from_escrow')
+    @patch('ico_manager.withdraw_from_escrow')
     @patch('main.get_client_and_program_id')
     def test_ico_withdraw_command(self, mock_get_client, mock_withdraw):
         """Tests the 'ico withdraw' command."""
@@ -200,7 +200,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn(f"Successfully withdrew {amount_lamports} lamports from escrow.", result.stdout)
         self.assertIn(f"Transaction signature: {MOCK_SIGNATURE}", result.stdout)
 
-    @patch('main.create_resource_access')
+    @patch('resource_manager.create_resource_access')
     @patch('main.get_client_and_program_id')
     def test_resource_create_command(self, mock_get_client, mock_create_resource):
         """Tests the 'resource create' command."""
@@ -229,7 +229,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn(f"Resource access '{resource_id}' created/updated successfully.", result.stdout)
         self.assertIn(f"Transaction signature: {MOCK_SIGNATURE}", result.stdout)
 
-    @patch('main.access_resource')
+    @patch('resource_manager.access_resource')
     @patch('main.get_client_and_program_id')
     def test_resource_access_command(self, mock_get_client, mock_access_resource):
         """Tests the 'resource access' command."""
@@ -314,7 +314,7 @@ class TestMainCLI(unittest.TestCase):
         self.assertIn("❌ Keypair Error: File not found", result.stdout) # Check stderr?
 
     # Example: Test how NotImplementedError is handled (for buy/sell)
-    @patch('main.buy_tokens', side_effect=NotImplementedError("Token mint determination needed"))
+    @patch('ico_manager.buy_tokens', side_effect=NotImplementedError("Token mint determination needed"))
     @patch('main.get_client_and_program_id')
     def test_ico_buy_command_not_implemented(self, mock_get_client, mock_buy_tokens):
         """Tests error handling for NotImplementedError during 'ico buy'."""
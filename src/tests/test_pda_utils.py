@@ -10,9 +10,9 @@ PDA calculation using mocked Solana program address functionality.
 import unittest
 from unittest.mock import patch, MagicMock
 
-# Import functions and exception from src
-import pda_utils
-from exceptions import PDAError
+# Import functions and exception through the src package so relative imports resolve
+from src import pda_utils
+from src.exceptions import PDAError
 
 # Import solders types
 from solders.pubkey import Pubkey
@@ -33,7 +33,14 @@ MOCK_RESOURCE_BUMP = 253
 
 class TestPdaUtils(unittest.TestCase):
 
-    @patch('pda_utils.Pubkey.find_program_address')
+    def setUp(self):
+        # PDA derivations are memoized; start each test with empty caches
+        pda_utils.find_ico_state_pda.cache_clear()
+        pda_utils.find_escrow_pda.cache_clear()
+        pda_utils.find_resource_state_pda.cache_clear()
+        pda_utils.find_associated_token_address.cache_clear()
+
+    @patch('src.pda_utils.Pubkey.find_program_address')
     def test_find_ico_state_pda_success(self, mock_find_program_address):
         """Tests successful derivation of ICO state PDA."""
         mock_find_program_address.return_value = (MOCK_ICO_PDA, MOCK_ICO_BUMP)
@@ -47,13 +54,24 @@ class TestPdaUtils(unittest.TestCase):
         self.assertEqual(pda, MOCK_ICO_PDA)
         self.assertEqual(bump, MOCK_ICO_BUMP)
 
-    @patch('pda_utils.Pubkey.find_program_address', side_effect=Exception("Derivation failed"))
+    @patch('src.pda_utils.Pubkey.find_program_address')
+    def test_find_ico_state_pda_memoized(self, mock_find_program_address):
+        """Tests that repeated ICO state PDA lookups only derive the address once."""
+        mock_find_program_address.return_value = (MOCK_ICO_PDA, MOCK_ICO_BUMP)
+
+        first = pda_utils.find_ico_state_pda(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
+        second = pda_utils.find_ico_state_pda(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
+
+        mock_find_program_address.assert_called_once()
+        self.assertEqual(first, second)
+
+    @patch('src.pda_utils.Pubkey.find_program_address', side_effect=Exception("Derivation failed"))
     def test_find_ico_state_pda_error(self, mock_find_program_address):
         """Tests PDAError on derivation failure for ICO state PDA."""
         with self.assertRaisesRegex(PDAError, "Failed to find ICO state PDA: Derivation failed"):
             pda_utils.find_ico_state_pda(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
 
-    @patch('pda_utils.Pubkey.find_program_address')
+    @patch('src.pda_utils.Pubkey.find_program_address')
     def test_find_escrow_pda_success(self, mock_find_program_address):
         """Tests successful derivation of escrow PDA."""
         mock_find_program_address.return_value = (MOCK_ESCROW_PDA, MOCK_ESCROW_BUMP)
@@ -67,13 +85,13 @@ class TestPdaUtils(unittest.TestCase):
         self.assertEqual(pda, MOCK_ESCROW_PDA)
         self.assertEqual(bump, MOCK_ESCROW_BUMP)
 
-    @patch('pda_utils.Pubkey.find_program_address', side_effect=Exception("Derivation failed"))
+    @patch('src.pda_utils.Pubkey.find_program_address', side_effect=Exception("Derivation failed"))
     def test_find_escrow_pda_error(self, mock_find_program_address):
         """Tests PDAError on derivation failure for escrow PDA."""
         with self.assertRaisesRegex(PDAError, "Failed to find escrow PDA: Derivation failed"):
             pda_utils.find_escrow_pda(MOCK_OWNER_PUBKEY, MOCK_PROGRAM_ID)
 
-    @patch('pda_utils.Pubkey.find_program_address')
+    @patch('src.pda_utils.Pubkey.find_program_address')
     def test_find_resource_state_pda_success(self, mock_find_program_address):
         """Tests successful derivation of resource state PDA."""
         mock_find_program_address.return_value = (MOCK_RESOURCE_PDA, MOCK_RESOURCE_BUMP)
@@ -87,11 +105,31 @@ class TestPdaUtils(unittest.TestCase):
         self.assertEqual(pda, MOCK_RESOURCE_PDA)
         self.assertEqual(bump, MOCK_RESOURCE_BUMP)
 
-    @patch('pda_utils.Pubkey.find_program_address', side_effect=Exception("Derivation failed"))
+    @patch('src.pda_utils.Pubkey.find_program_address', side_effect=Exception("Derivation failed"))
     def test_find_resource_state_pda_error(self, mock_find_program_address):
         """Tests PDAError on derivation failure for resource state PDA."""
         with self.assertRaisesRegex(PDAError, f"Failed to find resource state PDA for resource '{MOCK_RESOURCE_ID}': Derivation failed"):
             pda_utils.find_resource_state_pda(MOCK_SERVER_PUBKEY, MOCK_RESOURCE_ID, MOCK_PROGRAM_ID)
 
+    @patch('src.pda_utils.get_associated_token_address')
+    def test_find_associated_token_address_memoized(self, mock_get_ata):
+        """Tests that repeated ATA lookups for the same owner and mint only derive the address once."""
+        mock_mint = Pubkey.new_unique()
+        mock_ata = Pubkey.new_unique()
+        mock_get_ata.return_value = mock_ata
+
+        first = pda_utils.find_associated_token_address(MOCK_OWNER_PUBKEY, mock_mint)
+        second = pda_utils.find_associated_token_address(MOCK_OWNER_PUBKEY, mock_mint)
+
+        mock_get_ata.assert_called_once_with(MOCK_OWNER_PUBKEY, mock_mint)
+        self.assertEqual(first, mock_ata)
+        self.assertEqual(second, mock_ata)
+
+    @patch('src.pda_utils.get_associated_token_address', side_effect=Exception("Derivation failed"))
+    def test_find_associated_token_address_error(self, mock_get_ata):
+        """Tests PDAError on derivation failure for an ATA."""
+        with self.assertRaisesRegex(PDAError, "Failed to find associated token address: Derivation failed"):
+            pda_utils.find_associated_token_address(MOCK_OWNER_PUBKEY, Pubkey.new_unique())
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
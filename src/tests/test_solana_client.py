@@ -9,45 +9,66 @@ use extensive mocking to isolate the client from actual Solana RPC calls.
 
 import unittest
 import os
+import json
 from unittest.mock import patch, MagicMock, mock_open
 
-# Import necessary classes from src (assuming pytest runs from root)
-from solana_client import SolanaClient
-from config import get_cluster_url # To mock config dependency
-from exceptions import SolanaConnectionError, KeypairError, TransactionError, ConfigurationError
+# Import through the src package (pytest runs from root) so relative imports resolve
+from src import solana_client
+from src.solana_client import SolanaClient
+from src.config import get_cluster_url # To mock config dependency
+from src.exceptions import SolanaConnectionError, KeypairError, TransactionError, ConfigurationError
 
 # Import solders types for mocking
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
-from solders.rpc.api import Client as SoldersClient # Alias to avoid clash with solana.rpc.api.Client
-from solders.rpc.responses import GetBalanceResp, SendTransactionResp, GetAccountInfoResp, GetLatestBlockhashResp
-from solders.rpc.types import RPCResponse, Context, Blockhash
-from solders.transaction import Transaction, Signature
+from solders.rpc.responses import GetBalanceResp, SendTransactionResp, GetAccountInfoResp, GetLatestBlockhashResp, GetMultipleAccountsResp, RpcResponseContext
+from solders.account import Account
+from solders.rpc.requests import SendRawTransaction
+from solders.hash import Hash
+from solders.rpc.responses import RpcBlockhash
+from solders.signature import Signature
+from solders.transaction import Transaction
+from solders.message import Message
+from solders.instruction import Instruction, AccountMeta
+from solders.system_program import TransferParams, transfer
+from solana.exceptions import SolanaRpcException
+from solana.rpc.core import RPCException
+from solana.rpc.types import DataSliceOpts, TxOpts
 
 # Mock data
 MOCK_CLUSTER_URL = "http://mock-test-cluster:8899"
 MOCK_KEYPAIR_PATH = "fake_keypair.json"
 MOCK_SECRET_KEY_BYTES = bytes(range(64))
-MOCK_PUBLIC_KEY_STR = "MockPubkey11111111111111111111111111111111"
+MOCK_PUBLIC_KEY_STR = "US517G5965aydkZ46HS38QLi7UQiSojurfbQfKCELFx"
 MOCK_PUBLIC_KEY = Pubkey.from_string(MOCK_PUBLIC_KEY_STR)
-MOCK_SIGNATURE_STR = "MockSig" + "X" * 57 # Approx length
+MOCK_SIGNATURE_STR = "BUguQsv2ZuHus54HAFzjdJHzZBkygAjKhEeYwSG19tUfUyvvz3worsdQCdAXDNjakJHioSiyxhFiDJrm8XpSXRA"
 MOCK_SIGNATURE = Signature.from_string(MOCK_SIGNATURE_STR)
-MOCK_BLOCKHASH_STR = "MockBlockhash" + "Y" * 31 # Approx length
-MOCK_BLOCKHASH = Blockhash.from_string(MOCK_BLOCKHASH_STR)
+MOCK_BLOCKHASH_STR = "LbUiWL3xVV8hTFYBVdbTNrpDo41NKS6o3LHHuDzjfcY"
+MOCK_BLOCKHASH = Hash.from_string(MOCK_BLOCKHASH_STR)
+MOCK_ACCOUNT = Account(lamports=2039280, data=bytes(165), owner=Pubkey.new_unique())
+
+def _mock_transaction(wire_bytes=b"signed-tx"):
+    """Returns a Transaction mock that serializes to wire_bytes."""
+    mock_tx = MagicMock(spec=Transaction)
+    # spec'd mocks get a class of their own, so this only affects mock_tx
+    type(mock_tx).__bytes__ = lambda self: wire_bytes
+    mock_tx.signatures = [Signature.new_unique()]
+    return mock_tx
 
 class TestSolanaClient(unittest.TestCase):
 
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client') # Mock the underlying solana.rpc.api.Client
+    def setUp(self):
+        # RPC clients are cached per cluster URL; start each test with a fresh cache
+        solana_client._get_rpc_client.cache_clear()
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client') # Mock the underlying solana.rpc.api.Client
     def test_init_success(self, mock_rpc_client_constructor, mock_get_url):
         """Tests successful initialization of SolanaClient."""
         mock_rpc_client_instance = MagicMock()
         mock_rpc_client_instance.is_connected.return_value = True
         # Mock get_latest_blockhash response needed for connection check
-        mock_blockhash_resp = GetLatestBlockhashResp(
-            context=Context(slot=1),
-            value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100)
-        )
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_client_instance.get_latest_blockhash.return_value = mock_blockhash_resp
         mock_rpc_client_constructor.return_value = mock_rpc_client_instance
 
@@ -60,15 +81,48 @@ class TestSolanaClient(unittest.TestCase):
         self.assertEqual(client.cluster_url, MOCK_CLUSTER_URL)
         self.assertEqual(client.client, mock_rpc_client_instance)
 
-    @patch('solana_client.config.get_cluster_url', side_effect=ConfigurationError("URL not set"))
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_init_reuses_rpc_client(self, mock_rpc_client_constructor, mock_get_url):
+        """Tests that clients for the same cluster URL share one RPC client."""
+        mock_rpc_client_instance = MagicMock()
+        mock_rpc_client_instance.is_connected.return_value = True
+        mock_rpc_client_constructor.return_value = mock_rpc_client_instance
+
+        first = SolanaClient()
+        second = SolanaClient()
+
+        mock_rpc_client_constructor.assert_called_once_with(MOCK_CLUSTER_URL)
+        self.assertIs(first.client, second.client)
+
+    def test_rpc_clients_share_http_session(self):
+        """Tests that RPC clients for different URLs send requests over one keep-alive session."""
+        first = solana_client._get_rpc_client(MOCK_CLUSTER_URL)
+        second = solana_client._get_rpc_client("http://other:8899")
+
+        self.assertIsInstance(first._provider, solana_client._SessionHTTPProvider)
+        self.assertIs(first._provider._session, solana_client._get_http_session())
+        self.assertIs(second._provider._session, first._provider._session)
+
+    def test_session_provider_posts_through_session(self):
+        """Tests that the session provider sends batch requests with session.post."""
+        mock_session = MagicMock()
+        mock_session.post.return_value.text = "[]"
+        provider = solana_client._SessionHTTPProvider(MOCK_CLUSTER_URL, mock_session)
+
+        self.assertEqual(provider.make_batch_request_unparsed(()), "[]")
+        mock_session.post.assert_called_once()
+        self.assertEqual(mock_session.post.call_args.kwargs["url"], MOCK_CLUSTER_URL)
+
+    @patch('src.solana_client.config.get_cluster_url', side_effect=ConfigurationError("URL not set"))
     def test_init_config_error(self, mock_get_url):
         """Tests initialization failure due to config error."""
         with self.assertRaisesRegex(ConfigurationError, "URL not set"):
             SolanaClient()
         mock_get_url.assert_called_once()
 
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_init_connection_error_disconnected(self, mock_rpc_client_constructor, mock_get_url):
         """Tests initialization failure due to is_connected() returning False."""
         mock_rpc_client_instance = MagicMock()
@@ -79,14 +133,14 @@ class TestSolanaClient(unittest.TestCase):
             SolanaClient()
         mock_rpc_client_instance.is_connected.assert_called_once()
 
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_init_connection_error_rpc_exception(self, mock_rpc_client_constructor, mock_get_url):
         """Tests initialization failure due to RPCException during connection check."""
         mock_rpc_client_instance = MagicMock()
         mock_rpc_client_instance.is_connected.return_value = True
         # Simulate RPC error during blockhash fetch
-        mock_rpc_client_instance.get_latest_blockhash.side_effect = SolanaConnectionError("RPC Timeout") # Using our exception type for simplicity
+        mock_rpc_client_instance.get_latest_blockhash.side_effect = RPCException("RPC Timeout")
         mock_rpc_client_constructor.return_value = mock_rpc_client_instance
 
         with self.assertRaisesRegex(SolanaConnectionError, f"RPC error connecting to Solana cluster at {MOCK_CLUSTER_URL}: RPC Timeout"):
@@ -95,15 +149,15 @@ class TestSolanaClient(unittest.TestCase):
 
 
     @patch('builtins.open', new_callable=mock_open, read_data="[1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64]")
-    @patch('solana_client.Keypair') # Mock solders.keypair.Keypair
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL) # Need to mock config for init
-    @patch('solana_client.Client') # Need to mock rpc client for init
+    @patch('src.solana_client.Keypair') # Mock solders.keypair.Keypair
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL) # Need to mock config for init
+    @patch('src.solana_client.Client') # Need to mock rpc client for init
     def test_load_keypair_success(self, mock_rpc_client, mock_get_url, mock_solders_keypair, mock_file):
         """Tests successful loading of a keypair."""
         # Prevent SolanaClient init from actually connecting
         mock_rpc_instance = MagicMock()
         mock_rpc_instance.is_connected.return_value = True
-        mock_blockhash_resp = GetLatestBlockhashResp(context=Context(slot=1), value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100))
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
         mock_rpc_client.return_value = mock_rpc_instance
 
@@ -121,12 +175,12 @@ class TestSolanaClient(unittest.TestCase):
         self.assertEqual(loaded_keypair, mock_loaded_keypair)
 
     @patch('builtins.open', side_effect=FileNotFoundError)
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_load_keypair_file_not_found(self, mock_rpc_client, mock_get_url, mock_file):
         """Tests KeypairError when the keypair file is not found."""
         mock_rpc_instance = MagicMock(); mock_rpc_instance.is_connected.return_value = True
-        mock_blockhash_resp = GetLatestBlockhashResp(context=Context(slot=1), value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100))
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
         mock_rpc_client.return_value = mock_rpc_instance
 
@@ -135,12 +189,12 @@ class TestSolanaClient(unittest.TestCase):
             client.load_keypair(MOCK_KEYPAIR_PATH)
 
     @patch('builtins.open', new_callable=mock_open, read_data="invalid,data")
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_load_keypair_invalid_format(self, mock_rpc_client, mock_get_url, mock_file):
         """Tests KeypairError when the keypair file has invalid format."""
         mock_rpc_instance = MagicMock(); mock_rpc_instance.is_connected.return_value = True
-        mock_blockhash_resp = GetLatestBlockhashResp(context=Context(slot=1), value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100))
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
         mock_rpc_client.return_value = mock_rpc_instance
 
@@ -148,22 +202,19 @@ class TestSolanaClient(unittest.TestCase):
         with self.assertRaisesRegex(KeypairError, f"Invalid secret key format in file: {MOCK_KEYPAIR_PATH}"):
             client.load_keypair(MOCK_KEYPAIR_PATH)
 
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_get_balance_success(self, mock_rpc_client_constructor, mock_get_url):
         """Tests successful retrieval of balance."""
         mock_rpc_instance = MagicMock()
         mock_rpc_instance.is_connected.return_value = True
-        mock_blockhash_resp = GetLatestBlockhashResp(context=Context(slot=1), value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100))
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
         mock_rpc_client_constructor.return_value = mock_rpc_instance
 
         # Mock the get_balance response
         balance_value = 1_000_000_000 # 1 SOL
-        mock_balance_resp = GetBalanceResp(
-             context=Context(slot=1),
-             value=balance_value
-        )
+        mock_balance_resp = GetBalanceResp(balance_value, RpcResponseContext(1))
         # Note: solders GetBalanceResp structure is simpler than older solana-py
         mock_rpc_instance.get_balance.return_value = mock_balance_resp
 
@@ -173,12 +224,12 @@ class TestSolanaClient(unittest.TestCase):
         mock_rpc_instance.get_balance.assert_called_once_with(MOCK_PUBLIC_KEY)
         self.assertEqual(balance, balance_value)
 
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_get_balance_invalid_pubkey(self, mock_rpc_client_constructor, mock_get_url):
         """Tests ValueError for invalid public key string in get_balance."""
         mock_rpc_instance = MagicMock(); mock_rpc_instance.is_connected.return_value = True
-        mock_blockhash_resp = GetLatestBlockhashResp(context=Context(slot=1), value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100))
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
         mock_rpc_client_constructor.return_value = mock_rpc_instance
 
@@ -186,32 +237,346 @@ class TestSolanaClient(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Invalid public key format: invalid-key"):
             client.get_balance("invalid-key")
 
-    @patch('solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
-    @patch('solana_client.Client')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
     def test_send_transaction_success(self, mock_rpc_client_constructor, mock_get_url):
         """Tests successful sending of a transaction."""
         mock_rpc_instance = MagicMock()
         mock_rpc_instance.is_connected.return_value = True
         # Mock blockhash response
-        mock_blockhash_resp = GetLatestBlockhashResp(context=Context(slot=1), value=GetLatestBlockhashResp.Value(blockhash=MOCK_BLOCKHASH, last_valid_block_height=100))
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
         mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
-        # Mock send_transaction response
+        # Mock send_raw_transaction response
         mock_send_tx_resp = SendTransactionResp(value=MOCK_SIGNATURE)
-        mock_rpc_instance.send_transaction.return_value = mock_send_tx_resp
+        mock_rpc_instance.send_raw_transaction.return_value = mock_send_tx_resp
         mock_rpc_client_constructor.return_value = mock_rpc_instance
 
         client = SolanaClient()
-        mock_tx = MagicMock(spec=Transaction)
+        mock_tx = _mock_transaction()
         mock_signer = MagicMock(spec=Keypair)
 
         result = client.send_transaction(mock_tx, mock_signer)
 
+        # The blockhash fetched by the connection check is reused for the send
         mock_rpc_instance.get_latest_blockhash.assert_called_once()
-        # Check that recent_blockhash was set on the transaction object
-        self.assertEqual(mock_tx.recent_blockhash, MOCK_BLOCKHASH)
-        mock_rpc_instance.send_transaction.assert_called_once_with(mock_tx, mock_signer)
+        # The transaction is signed against the cached blockhash
+        mock_tx.sign.assert_called_once_with([mock_signer], MOCK_BLOCKHASH)
+        # Preflight stays on and the node keeps rebroadcasting unless the caller opts out
+        mock_rpc_instance.send_raw_transaction.assert_called_once_with(b"signed-tx", opts=TxOpts())
         self.assertEqual(result, mock_send_tx_resp)
 
+    @patch('src.solana_client.time.sleep')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_send_transaction_retries_transport_errors(self, mock_rpc_client_constructor, mock_get_url, mock_sleep):
+        """Tests that a transport failure resubmits the transaction with the same blockhash."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
+        mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
+        mock_send_tx_resp = SendTransactionResp(Signature.new_unique())
+        mock_rpc_instance.send_raw_transaction.side_effect = [SolanaRpcException(TimeoutError(), None, None, None), mock_send_tx_resp]
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        mock_tx = _mock_transaction()
+
+        client = SolanaClient()
+        result = client.send_transaction(mock_tx, MagicMock(spec=Keypair), skip_preflight=True)
+
+        self.assertEqual(result, mock_send_tx_resp)
+        # Signed and serialized once; the resubmit reuses the same bytes
+        mock_tx.sign.assert_called_once()
+        self.assertEqual(mock_rpc_instance.send_raw_transaction.call_count, 2)
+        for call in mock_rpc_instance.send_raw_transaction.call_args_list:
+            self.assertEqual(call.args, (b"signed-tx",))
+            self.assertEqual(call.kwargs["opts"], TxOpts(skip_preflight=True, max_retries=None))
+        mock_sleep.assert_called_once_with(solana_client.SEND_RETRY_BASE_DELAY_SECONDS)
+
+    @patch('src.solana_client.time.sleep')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_send_raw_gives_up_after_attempts(self, mock_rpc_client_constructor, mock_get_url, mock_sleep):
+        """Tests that repeated transport failures raise TransactionError."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
+        mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
+        mock_rpc_instance.send_raw_transaction.side_effect = SolanaRpcException(TimeoutError(), None, None, None)
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+
+        client = SolanaClient()
+        with self.assertRaises(TransactionError):
+            client.send_raw(b"signed-tx")
+        self.assertEqual(mock_rpc_instance.send_raw_transaction.call_count, solana_client.SEND_ATTEMPTS)
+        mock_rpc_instance.send_raw_transaction.assert_called_with(b"signed-tx", opts=TxOpts())
+
+    @patch('src.solana_client._get_http_session')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_get_priority_fee_median_cached(self, mock_rpc_client_constructor, mock_get_url, mock_get_session):
+        """Tests that the priority fee is the median non-zero recent fee and is cached."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        mock_session = mock_get_session.return_value
+        mock_session.post.return_value.json.return_value = {
+            "jsonrpc": "2.0", "id": 0,
+            "result": [{"slot": slot, "prioritizationFee": fee} for slot, fee in enumerate([0, 300, 100, 0, 200])],
+        }
+        account = Pubkey.new_unique()
+
+        client = SolanaClient()
+        self.assertEqual(client.get_priority_fee([account]), 200)
+        self.assertEqual(client.get_priority_fee([account]), 200)
+
+        mock_session.post.assert_called_once()
+        self.assertEqual(mock_session.post.call_args.kwargs["json"]["params"], [[str(account)]])
+
+    @patch('src.solana_client._get_http_session')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_get_priority_fee_rpc_error(self, mock_rpc_client_constructor, mock_get_url, mock_get_session):
+        """Tests that an RPC error response raises SolanaConnectionError."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        mock_get_session.return_value.post.return_value.json.return_value = {
+            "jsonrpc": "2.0", "id": 0, "error": {"code": -32601, "message": "Method not found"},
+        }
+
+        client = SolanaClient()
+        with self.assertRaises(SolanaConnectionError):
+            client.get_priority_fee([Pubkey.new_unique()])
+
+    @patch('src.solana_client.time.monotonic')
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_send_transaction_refreshes_expired_blockhash(self, mock_rpc_client_constructor, mock_get_url, mock_monotonic):
+        """Tests that the cached blockhash is refetched once its TTL has passed."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
+        mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        mock_monotonic.return_value = 100.0
+
+        client = SolanaClient()
+        client.send_transaction(_mock_transaction(), MagicMock(spec=Keypair))
+        self.assertEqual(mock_rpc_instance.get_latest_blockhash.call_count, 1)
+
+        mock_monotonic.return_value = 100.0 + solana_client.BLOCKHASH_TTL_SECONDS
+        client.send_transaction(_mock_transaction(), MagicMock(spec=Keypair))
+        self.assertEqual(mock_rpc_instance.get_latest_blockhash.call_count, 2)
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_send_transaction_resigns_duplicate_under_new_blockhash(self, mock_rpc_client_constructor, mock_get_url):
+        """Tests that resending identical instructions refetches the blockhash instead of repeating a signature."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        newer_blockhash = Hash.new_unique()
+        mock_rpc_instance.get_latest_blockhash.side_effect = [
+            GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1)),
+            GetLatestBlockhashResp(RpcBlockhash(newer_blockhash, 101), RpcResponseContext(2)),
+        ]
+        mock_rpc_instance.send_raw_transaction.return_value = SendTransactionResp(MOCK_SIGNATURE)
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        payer = Keypair()
+
+        def make_transaction():
+            transfer_ix = transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=MOCK_PUBLIC_KEY, lamports=1000))
+            return Transaction.new_unsigned(Message([transfer_ix], payer.pubkey()))
+
+        client = SolanaClient()
+        first, second = make_transaction(), make_transaction()
+        client.send_transaction(first, payer)
+        client.send_transaction(second, payer)
+
+        self.assertEqual(mock_rpc_instance.get_latest_blockhash.call_count, 2)
+        self.assertEqual(first.message.recent_blockhash, MOCK_BLOCKHASH)
+        self.assertEqual(second.message.recent_blockhash, newer_blockhash)
+        self.assertNotEqual(first.signatures[0], second.signatures[0])
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_get_account_info_cached(self, mock_rpc_client_constructor, mock_get_url):
+        """Tests that cached account info lookups only hit the RPC once for existing accounts."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_account_resp = GetAccountInfoResp(MOCK_ACCOUNT, RpcResponseContext(1))
+        mock_rpc_instance.get_account_info.return_value = mock_account_resp
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+
+        client = SolanaClient()
+        first = client.get_account_info(MOCK_PUBLIC_KEY, cached=True)
+        second = client.get_account_info(MOCK_PUBLIC_KEY, cached=True)
+
+        mock_rpc_instance.get_account_info.assert_called_once_with(MOCK_PUBLIC_KEY)
+        self.assertEqual(first, mock_account_resp)
+        self.assertEqual(second, mock_account_resp)
+
+        # Uncached lookups always go to the RPC
+        client.get_account_info(MOCK_PUBLIC_KEY)
+        self.assertEqual(mock_rpc_instance.get_account_info.call_count, 2)
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_get_account_info_cached_missing_account(self, mock_rpc_client_constructor, mock_get_url):
+        """Tests that responses for missing accounts are not cached."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_account_resp = GetAccountInfoResp(None, RpcResponseContext(1))
+        mock_rpc_instance.get_account_info.return_value = mock_account_resp
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+
+        client = SolanaClient()
+        client.get_account_info(MOCK_PUBLIC_KEY, cached=True)
+        client.get_account_info(MOCK_PUBLIC_KEY, cached=True)
+
+        self.assertEqual(mock_rpc_instance.get_account_info.call_count, 2)
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_accounts_exist_requests_no_data(self, mock_rpc_client_constructor, mock_get_url):
+        """Tests that existence checks use a zero-length data slice and remember accounts that exist."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        other_pubkey = Pubkey.new_unique()
+        mock_rpc_instance.get_multiple_accounts.return_value = GetMultipleAccountsResp([MOCK_ACCOUNT, None], RpcResponseContext(2))
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+
+        client = SolanaClient()
+        self.assertEqual(client.accounts_exist([MOCK_PUBLIC_KEY, other_pubkey], cached=True), [True, False])
+        mock_rpc_instance.get_multiple_accounts.assert_called_once_with(
+            [MOCK_PUBLIC_KEY, other_pubkey], data_slice=DataSliceOpts(offset=0, length=0)
+        )
+
+        # The existing account is not rechecked; the missing one is
+        mock_rpc_instance.get_multiple_accounts.return_value = GetMultipleAccountsResp([None], RpcResponseContext(3))
+        self.assertEqual(client.accounts_exist([MOCK_PUBLIC_KEY, other_pubkey], cached=True), [True, False])
+        mock_rpc_instance.get_multiple_accounts.assert_called_with([other_pubkey], data_slice=DataSliceOpts(offset=0, length=0))
+        self.assertTrue(client.account_exists(MOCK_PUBLIC_KEY, cached=True))
+        self.assertEqual(mock_rpc_instance.get_multiple_accounts.call_count, 2)
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    def test_sending_forgets_written_accounts(self, mock_rpc_client_constructor, mock_get_url):
+        """Tests that a transaction writing to a cached account makes the next check go to the RPC."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_rpc_instance.get_latest_blockhash.return_value = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
+        mock_rpc_instance.get_multiple_accounts.return_value = GetMultipleAccountsResp([MOCK_ACCOUNT, MOCK_ACCOUNT], RpcResponseContext(2))
+        mock_rpc_instance.send_raw_transaction.side_effect = RPCException("account not found")
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        payer = Keypair()
+        read_only_pubkey = Pubkey.new_unique()
+        instruction = Instruction(Pubkey.new_unique(), b"", [
+            AccountMeta(MOCK_PUBLIC_KEY, is_signer=False, is_writable=True),
+            AccountMeta(read_only_pubkey, is_signer=False, is_writable=False),
+        ])
+
+        client = SolanaClient()
+        client.accounts_exist([MOCK_PUBLIC_KEY, read_only_pubkey], cached=True)
+        with self.assertRaises(TransactionError):
+            client.send_transaction(Transaction.new_unsigned(Message([instruction], payer.pubkey())), payer)
+
+        # Only the written account is rechecked
+        mock_rpc_instance.get_multiple_accounts.return_value = GetMultipleAccountsResp([None], RpcResponseContext(3))
+        self.assertEqual(client.accounts_exist([MOCK_PUBLIC_KEY, read_only_pubkey], cached=True), [False, True])
+        mock_rpc_instance.get_multiple_accounts.assert_called_with([MOCK_PUBLIC_KEY], data_slice=DataSliceOpts(offset=0, length=0))
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    @patch('src.solana_client._SessionHTTPProvider')
+    def test_batch_restores_request_order(self, mock_provider_constructor, mock_rpc_client_constructor, mock_get_url):
+        """Tests that batch responses are matched back to requests by id."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        other_signature = Signature.new_unique()
+        # Node answers out of order
+        mock_provider_constructor.return_value.make_batch_request_unparsed.return_value = json.dumps([
+            {"jsonrpc": "2.0", "result": str(other_signature), "id": 1},
+            {"jsonrpc": "2.0", "result": str(MOCK_SIGNATURE), "id": 0},
+        ])
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+
+        client = SolanaClient()
+        results = client.batch(
+            [SendRawTransaction(b"tx0", None, 0), SendRawTransaction(b"tx1", None, 1)],
+            [SendTransactionResp, SendTransactionResp],
+        )
+
+        mock_provider_constructor.return_value.make_batch_request_unparsed.assert_called_once()
+        self.assertEqual([result.value for result in results], [MOCK_SIGNATURE, other_signature])
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    @patch('src.solana_client._SessionHTTPProvider')
+    def test_send_transactions_returns_result_per_transaction(self, mock_provider_constructor, mock_rpc_client_constructor, mock_get_url):
+        """Tests that a rejected transaction doesn't hide the results of the rest of the batch."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_blockhash_resp = GetLatestBlockhashResp(RpcBlockhash(MOCK_BLOCKHASH, 100), RpcResponseContext(1))
+        mock_rpc_instance.get_latest_blockhash.return_value = mock_blockhash_resp
+        mock_provider_constructor.return_value.make_batch_request_unparsed.return_value = json.dumps([
+            {"jsonrpc": "2.0", "result": str(MOCK_SIGNATURE), "id": 0},
+            {"jsonrpc": "2.0", "error": {"code": -32602, "message": "invalid transaction"}, "id": 1},
+        ])
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        signer = MagicMock(spec=Keypair)
+
+        client = SolanaClient()
+        results = client.send_transactions(
+            [(_mock_transaction(b"tx0"), [signer]), (_mock_transaction(b"tx1"), [signer])], skip_preflight=True
+        )
+
+        self.assertEqual(results[0], SendTransactionResp(MOCK_SIGNATURE))
+        self.assertNotIsInstance(results[1], SendTransactionResp)
+        requests = mock_provider_constructor.return_value.make_batch_request_unparsed.call_args.args[0]
+        self.assertEqual([bytes(request.tx) for request in requests], [b"tx0", b"tx1"])
+        self.assertTrue(all(request.config.skip_preflight for request in requests))
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    @patch('src.solana_client._SessionHTTPProvider')
+    def test_send_transactions_empty(self, mock_provider_constructor, mock_rpc_client_constructor, mock_get_url):
+        """Tests that an empty batch is not sent."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+
+        client = SolanaClient()
+        self.assertEqual(client.send_transactions([]), [])
+        mock_provider_constructor.return_value.make_batch_request_unparsed.assert_not_called()
+
+    @patch('src.solana_client.config.get_cluster_url', return_value=MOCK_CLUSTER_URL)
+    @patch('src.solana_client.Client')
+    @patch('src.solana_client._SessionHTTPProvider')
+    def test_simulate_compute_units(self, mock_provider_constructor, mock_rpc_client_constructor, mock_get_url):
+        """Tests that simulation reports consumed units, and separates failed transactions from RPC failures."""
+        mock_rpc_instance = MagicMock()
+        mock_rpc_instance.is_connected.return_value = True
+        mock_rpc_client_constructor.return_value = mock_rpc_instance
+        mock_provider = mock_provider_constructor.return_value
+        mock_provider.make_request.return_value.value.err = None
+        mock_provider.make_request.return_value.value.units_consumed = 1234
+        payer = Keypair()
+        transaction = Transaction.new_unsigned(Message(
+            [transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=MOCK_PUBLIC_KEY, lamports=1000))], payer.pubkey()
+        ))
+
+        client = SolanaClient()
+        self.assertEqual(client.simulate_compute_units(transaction), 1234)
+        request = mock_provider.make_request.call_args.args[0]
+        self.assertTrue(request.config.replace_recent_blockhash)
+
+        mock_provider.make_request.return_value.value.err = "InstructionError"
+        with self.assertRaises(TransactionError):
+            client.simulate_compute_units(transaction)
+
+        mock_provider.make_request.side_effect = RPCException("node is behind")
+        with self.assertRaises(SolanaConnectionError):
+            client.simulate_compute_units(transaction)
+
     # Add more tests for send_sol, get_account_info, confirm_transaction,
     # and error handling within those methods (e.g., RPCException -> TransactionError)
 